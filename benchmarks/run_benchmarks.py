@@ -0,0 +1,251 @@
+"""Pipeline benchmark suite.
+
+Runs load -> clean -> RFM -> prepare/train -> plots -> score on synthetic
+transaction tables of a chosen size tier, appends the per-stage timings and
+peak memory to a JSON-lines history file and compares them with a stored
+baseline. An untimed warm-up pass absorbs import and JIT costs, timings
+are the fastest of several runs with tracemalloc off, and peak memory comes
+from a separate traced pass. A stage regresses only when it exceeds the
+baseline by both the relative threshold and an absolute tolerance.
+
+Timings are only comparable on the machine that produced them, so the
+baseline file is keyed by host name: run ``--save-baseline`` once on each
+new host (CI runner, workstation) before comparing there.
+
+Exits 1 when any stage regresses and 3 when this host has no baseline for a
+tier or stage.
+
+    python -m benchmarks.run_benchmarks --tiers 10k 1m
+    python -m benchmarks.run_benchmarks --tiers 10k --save-baseline
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from benchmarks.synthetic import make_transactions
+from config import (BENCHMARK_TIERS, BENCHMARK_HISTORY, BENCHMARK_BASELINE,
+                    BENCHMARK_THRESHOLD, BENCHMARK_TOLERANCE_SECONDS,
+                    BENCHMARK_TOLERANCE_MB, BENCHMARK_REPEAT)
+from data.cleaner import clean_data
+from data.loader import load_raw_data
+from features.rfm import calculate_rfm
+from models.trainer import prepare_data, train_model, predict_clv
+from utils.logger import get_logger
+from utils.profiler import start_run, set_memory_tracking
+from visualization.plots import generate_rfm_plots
+
+logger = get_logger(__name__)
+
+
+def run_pipeline_once(csv_path: str, label: str) -> Dict[str, dict]:
+    """Run every stage once and return the profiler figures keyed by stage."""
+    run = start_run(label)
+
+    raw = load_raw_data(csv_path)
+    cleaned = clean_data(raw) if raw is not None else None
+    rfm = calculate_rfm(cleaned) if cleaned is not None else None
+    if rfm is not None:
+        prepared = prepare_data(rfm)
+        if prepared is not None:
+            X_train, _, y_train, _, scaler = prepared
+            model = train_model(X_train, y_train)
+            generate_rfm_plots(rfm)
+            if model is not None:
+                predict_clv(rfm, model, scaler)
+
+    return {record.stage: record.to_dict() for record in run.stages}
+
+
+def _check_status(stages: Dict[str, dict], tier: str):
+    for name, record in stages.items():
+        if record['status'] != "ok":
+            raise RuntimeError(f"Stage '{name}' {record['status']} on tier {tier}")
+
+
+def benchmark_tier(tier: str, n_rows: int, repeat: int) -> Dict[str, dict]:
+    """Benchmark one tier.
+
+    One untimed warm-up run pays the matplotlib/joblib start-up cost,
+    timings are the fastest of ``repeat`` untraced runs, and tracemalloc
+    peaks come from one extra traced run so its overhead never reaches the
+    times.
+    """
+    logger.info(f"Benchmarking tier {tier} ({n_rows:,} rows)")
+    best: Dict[str, dict] = {}
+    label = f"benchmark-{tier}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, f"bench_{tier}.csv")
+        make_transactions(n_rows).to_csv(csv_path, index=False)
+
+        set_memory_tracking(False)
+        _check_status(run_pipeline_once(csv_path, label), tier)
+        for _ in range(repeat):
+            stages = run_pipeline_once(csv_path, label)
+            _check_status(stages, tier)
+            for name, record in stages.items():
+                if name not in best or record['wall_time_s'] < best[name]['wall_time_s']:
+                    best[name] = record
+
+        set_memory_tracking(True)
+        try:
+            traced = run_pipeline_once(csv_path, label)
+        finally:
+            set_memory_tracking(False)
+        _check_status(traced, tier)
+
+    return {
+        name: {
+            **{key: record[key] for key in
+               ('wall_time_s', 'cpu_time_s', 'sampled_peak_rss_mb', 'rows_in', 'rows_out')},
+            'traced_peak_mb': traced.get(name, {}).get('traced_peak_mb'),
+        }
+        for name, record in best.items()
+    }
+
+
+def append_history(results: Dict[str, Dict[str, dict]], path: str = BENCHMARK_HISTORY):
+    """Append one JSON line per tier to the history file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    timestamp = datetime.now().isoformat(timespec='seconds')
+    with open(path, 'a', encoding='utf-8') as f:
+        for tier, stages in results.items():
+            f.write(json.dumps({
+                'timestamp': timestamp,
+                'tier': tier,
+                'rows': BENCHMARK_TIERS[tier],
+                'host': platform.node(),
+                'python': platform.python_version(),
+                'stages': stages,
+            }) + "\n")
+
+
+def _read_baselines(path: str) -> Dict[str, Dict[str, Dict[str, dict]]]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_baseline(path: str = BENCHMARK_BASELINE,
+                  host: Optional[str] = None) -> Dict[str, Dict[str, dict]]:
+    """This host's baseline tiers; other machines' timings are not comparable."""
+    return _read_baselines(path).get(host or platform.node(), {})
+
+
+def save_baseline(results: Dict[str, Dict[str, dict]], path: str = BENCHMARK_BASELINE,
+                  host: Optional[str] = None):
+    """Merge the given tiers into this host's entry of the baseline file."""
+    host = host or platform.node()
+    baselines = _read_baselines(path)
+    baselines.setdefault(host, {}).update(results)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+    logger.info(f"Baseline updated for tiers {sorted(results)} on {host} in {path}")
+
+
+def find_regressions(results: Dict[str, Dict[str, dict]],
+                     baseline: Dict[str, Dict[str, dict]],
+                     threshold: float) -> List[str]:
+    """Describe every stage whose time or peak memory grew past both the
+    relative threshold and the absolute tolerance."""
+    regressions = []
+    for tier, stages in results.items():
+        for stage, current in stages.items():
+            base = baseline.get(tier, {}).get(stage)
+            if not base:
+                continue
+
+            base_time, cur_time = base['wall_time_s'], current['wall_time_s']
+            if (cur_time > base_time * (1 + threshold)
+                    and cur_time - base_time > BENCHMARK_TOLERANCE_SECONDS):
+                regressions.append(
+                    f"{tier}/{stage}: wall time {cur_time:.3f}s vs baseline {base_time:.3f}s")
+
+            base_mem, cur_mem = base.get('traced_peak_mb'), current.get('traced_peak_mb')
+            if (base_mem and cur_mem and cur_mem > base_mem * (1 + threshold)
+                    and cur_mem - base_mem > BENCHMARK_TOLERANCE_MB):
+                regressions.append(
+                    f"{tier}/{stage}: peak memory {cur_mem:.1f}MB vs baseline {base_mem:.1f}MB")
+    return regressions
+
+
+def find_missing_baselines(results: Dict[str, Dict[str, dict]],
+                           baseline: Dict[str, Dict[str, dict]]) -> List[str]:
+    """Tiers and stages that have nothing to be compared against."""
+    missing = []
+    for tier, stages in results.items():
+        if tier not in baseline:
+            missing.append(f"{tier}: no baseline for this tier on {platform.node()}")
+            continue
+        missing.extend(f"{tier}/{stage}: no baseline for this stage"
+                       for stage in stages if stage not in baseline[tier])
+    return missing
+
+
+def print_results(results: Dict[str, Dict[str, dict]]):
+    for tier, stages in results.items():
+        print(f"\n== {tier} ({BENCHMARK_TIERS[tier]:,} rows) ==")
+        print(f"{'stage':<10}{'wall s':>10}{'cpu s':>10}{'peak MB':>10}{'rows in':>12}{'rows out':>12}")
+        for stage, r in stages.items():
+            print(f"{stage:<10}{r['wall_time_s']:>10.3f}{r['cpu_time_s']:>10.3f}"
+                  f"{r['traced_peak_mb'] or 0:>10.1f}{r['rows_in'] or '':>12}{r['rows_out'] or '':>12}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the CLV pipeline at synthetic scale tiers")
+    parser.add_argument("--tiers", nargs="+", default=["10k"], choices=sorted(BENCHMARK_TIERS),
+                        help="Scale tiers to run (default: 10k)")
+    parser.add_argument("--repeat", type=int, default=BENCHMARK_REPEAT,
+                        help=f"Timed runs per tier after a warm-up; fastest is kept "
+                             f"(default: {BENCHMARK_REPEAT})")
+    parser.add_argument("--threshold", type=float, default=BENCHMARK_THRESHOLD,
+                        help="Allowed fractional regression against the baseline")
+    parser.add_argument("--baseline", default=BENCHMARK_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--history", default=BENCHMARK_HISTORY, help="History JSON-lines file")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store these results as this host's baseline instead of comparing")
+    args = parser.parse_args(argv)
+
+    try:
+        results = {tier: benchmark_tier(tier, BENCHMARK_TIERS[tier], max(1, args.repeat))
+                   for tier in args.tiers}
+    except Exception as e:
+        logger.error(f"Benchmark failed: {e}")
+        return 2
+
+    print_results(results)
+    append_history(results, args.history)
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    regressions = find_regressions(results, baseline, args.threshold)
+    if regressions:
+        print("\nPerformance regressions:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+
+    missing = find_missing_baselines(results, baseline)
+    if missing:
+        print(f"\nWARNING: incomplete baseline for {platform.node()} in {args.baseline} "
+              f"(run with --save-baseline on this host):")
+        for line in missing:
+            print(f"  {line}")
+        return 3
+
+    print("\nNo regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+COUNTRIES = np.array(['United Kingdom', 'Germany', 'France', 'EIRE', 'Spain',
+                      'Netherlands', 'Belgium', 'Switzerland', 'Portugal', 'Australia'])
+COUNTRY_WEIGHTS = np.array([0.82, 0.04, 0.035, 0.03, 0.015, 0.015, 0.012, 0.01, 0.01, 0.013])
+
+
+def make_transactions(n_rows: int, seed: int = 42, invalid_fraction: float = 0.03) -> pd.DataFrame:
+    """Generate an online-retail shaped transaction table of ``n_rows`` rows.
+
+    Roughly one customer per hundred rows and five lines per invoice, with a
+    small share of returns, zero prices and missing customer IDs so the
+    cleaning stage has realistic work to do.
+    """
+    rng = np.random.default_rng(seed)
+    n_customers = max(100, n_rows // 100)
+    n_invoices = max(1, n_rows // 5)
+
+    invoice_ids = np.sort(rng.integers(0, n_invoices, n_rows))
+    invoice_customer = rng.integers(12000, 12000 + n_customers, n_invoices).astype(float)
+    invoice_country = rng.choice(COUNTRIES, n_invoices, p=COUNTRY_WEIGHTS / COUNTRY_WEIGHTS.sum())
+    invoice_offsets = np.sort(rng.integers(0, 2 * 365 * 24 * 3600, n_invoices))
+
+    quantity = rng.integers(1, 24, n_rows)
+    price = np.round(rng.lognormal(1.0, 0.8, n_rows), 2)
+    customer = invoice_customer[invoice_ids]
+
+    n_invalid = int(n_rows * invalid_fraction)
+    if n_invalid:
+        bad = rng.choice(n_rows, n_invalid, replace=False)
+        third = n_invalid // 3
+        quantity[bad[:third]] *= -1
+        price[bad[third:2 * third]] = 0.0
+        customer[bad[2 * third:]] = np.nan
+
+    stock = rng.integers(10000, 10000 + 4000, n_rows)
+    return pd.DataFrame({
+        'Invoice': (invoice_ids + 489434).astype(str),
+        'StockCode': stock.astype(str),
+        'Description': pd.Categorical.from_codes(stock % 500, [f'Product {i}' for i in range(500)]),
+        'Quantity': quantity,
+        'InvoiceDate': pd.Timestamp('2009-12-01') + pd.to_timedelta(invoice_offsets[invoice_ids], unit='s'),
+        'Price': price,
+        'Customer ID': customer,
+        'Country': invoice_country[invoice_ids],
+    })
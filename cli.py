@@ -0,0 +1,114 @@
+"""Headless batch entry point.
+
+Runs load -> clean -> RFM -> train/score -> plots/export without Tk so CLV
+refreshes can be scheduled from cron or a container. Stage outputs are cached
+in the artifact store, so a re-run only recomputes what changed:
+
+    python main.py --input data/online_retail_II.csv --stages rfm,train,score,export
+    python main.py --input data/online_retail_II.csv --dry-run
+
+Exit codes: 0 success, 1 a stage failed, 2 bad arguments, 3 input missing.
+"""
+import argparse
+import os
+import sys
+from typing import List, Optional
+from config import DATA_PATH, N_JOBS, ARTIFACT_KEEP_PER_STAGE, EXPORT_FORMAT, PARTITION_KEY
+from utils.logger import get_logger
+from utils.profiler import start_run
+
+logger = get_logger(__name__)
+
+EXIT_OK = 0
+EXIT_STAGE_FAILED = 1
+EXIT_USAGE = 2
+EXIT_INPUT_MISSING = 3
+
+STAGES = ('load', 'clean', 'rfm', 'prepare', 'train', 'score', 'plots', 'export', 'publish',
+          'partitioned')
+# Per-partition models are opt-in; everything else runs by default
+DEFAULT_STAGES = STAGES[:-1]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Run the CLV pipeline headlessly (no arguments starts the desktop UI)"
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--input", "-i", default=None,
+                        help=f"Transactions CSV (default: {DATA_PATH})")
+    source.add_argument("--sample", action="store_true",
+                        help="Use generated sample data instead of a CSV")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="Parse the CSV in chunks of this many rows, compacting each "
+                             "to lower peak memory")
+    parser.add_argument("--workers", "-j", type=int, default=N_JOBS,
+                        help="Worker processes for model training and partitions (-1 = all cores)")
+    parser.add_argument("--stages", default=",".join(DEFAULT_STAGES),
+                        help=f"Comma-separated stages to run; prerequisites are added "
+                             f"automatically (choices: {', '.join(STAGES)})")
+    parser.add_argument("--export-format", default=EXPORT_FORMAT,
+                        choices=['csv', 'csv.gz', 'parquet', 'feather'],
+                        help=f"Format for exported tables (default: {EXPORT_FORMAT})")
+    parser.add_argument("--partition-by", default=PARTITION_KEY,
+                        help=f"Column splitting data for the partitioned stage (default: {PARTITION_KEY})")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Show which stages would run or come from cache, then exit")
+    parser.add_argument("--force", action="store_true",
+                        help="Recompute every selected stage, ignoring cached artifacts")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        return EXIT_OK if e.code == 0 else EXIT_USAGE
+
+    requested = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = [s for s in requested if s not in STAGES]
+    if unknown or not requested:
+        parser.print_usage(sys.stderr)
+        print(f"Unknown or empty stages: {unknown}", file=sys.stderr)
+        return EXIT_USAGE
+    if args.chunk_size is not None and args.chunk_size <= 0:
+        print("--chunk-size must be positive", file=sys.stderr)
+        return EXIT_USAGE
+
+    input_path = args.input or DATA_PATH
+    if not args.sample and not os.path.exists(input_path):
+        logger.error(f"Input file not found: {input_path}")
+        return EXIT_INPUT_MISSING
+
+    from pipeline.dag import StageFailed
+    from pipeline.stages import build_clv_pipeline
+    pipeline = build_clv_pipeline(input_path, args.chunk_size, args.workers, args.sample,
+                                  export_format=args.export_format,
+                                  partition_key=args.partition_by)
+
+    if args.dry_run:
+        width = max(len(name) for name in STAGES) + 2
+        for step in pipeline.plan(requested):
+            print(f"{step.stage:<{width}}{'run' if args.force else step.action}")
+        return EXIT_OK
+
+    run = start_run("cli")
+    try:
+        pipeline.run(requested, force=args.force)
+    except StageFailed as e:
+        logger.error(str(e))
+        return EXIT_STAGE_FAILED
+    except Exception as e:
+        logger.error(f"Pipeline failed: {e}", exc_info=True)
+        return EXIT_STAGE_FAILED
+
+    pipeline.store.evict(ARTIFACT_KEEP_PER_STAGE)
+    logger.info(f"Pipeline complete: {', '.join(pipeline.resolve(requested))} "
+                f"({run.to_dict()['total_wall_time_s']:.2f}s profiled)")
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
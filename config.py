@@ -17,7 +17,46 @@ TEST_SIZE = 0.2
 N_ESTIMATORS = 200
 MAX_DEPTH = 10
 MIN_SAMPLES_SPLIT = 5
+N_JOBS = -1  # Worker processes for model training (-1 = all cores)
 
 # Visualization
 PLOT_STYLE = "seaborn"
-FIG_SIZE = (15, 5)
\ No newline at end of file
+FIG_SIZE = (15, 5)
+
+# Profiling
+PROFILE_ENABLED = True
+PROFILE_TRACK_MEMORY = False  # tracemalloc peaks; slows pandas-heavy stages up to ~10x
+PROFILE_SAMPLE_RSS = True  # Cheap per-stage peak from polling process RSS
+PROFILE_SAMPLE_INTERVAL = 0.02  # Seconds between RSS samples
+PROFILE_CPROFILE = False
+PROFILE_DIR = os.path.join(OUTPUT_DIR, "profiles")
+PROFILE_KEEP_REPORTS = 20  # Run reports kept in PROFILE_DIR
+
+# Benchmarks
+BENCHMARK_TIERS = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+BENCHMARK_HISTORY = os.path.join(OUTPUT_DIR, "benchmark_history.jsonl")
+BENCHMARK_BASELINE = os.path.join(BASE_DIR, "benchmarks", "baseline.json")
+BENCHMARK_THRESHOLD = 0.25  # Allowed fractional slowdown / memory growth per stage
+BENCHMARK_TOLERANCE_SECONDS = 0.25  # ...and the absolute slowdown it must also exceed (VM noise)
+BENCHMARK_TOLERANCE_MB = 5.0  # ...and the absolute memory growth it must also exceed
+BENCHMARK_REPEAT = 3  # Timed runs per tier after the warm-up; fastest is kept
+
+# Pipeline artifact cache
+ARTIFACT_DIR = os.path.join(OUTPUT_DIR, "artifacts")
+ARTIFACT_KEEP_PER_STAGE = 2  # Cached results kept per stage before eviction
+ANALYSIS_CACHE_DIR = os.path.join(OUTPUT_DIR, "analysis_cache")  # UI lookalike-index cache
+ANALYSIS_CACHE_KEEP = 2  # Cached results kept per analysis kind
+
+# Export
+EXPORT_FORMAT = "csv"  # csv, csv.gz, parquet or feather (columnar formats need pyarrow)
+EXPORT_CHUNK_SIZE = 100_000  # Rows written per chunk
+EXPORT_COMPRESSION = "zstd"  # Codec for parquet / feather
+
+# Feature store
+FEATURE_STORE_DIR = os.path.join(OUTPUT_DIR, "feature_store")
+FEATURE_STORE_KEEP = 3  # Published snapshots kept for readers still mapping old ones
+
+# Partitioned mode
+PARTITION_KEY = "Country"
+PARTITION_MIN_CUSTOMERS = 50  # Smaller partitions get RFM and segments but no model
+PARTITION_DIR = os.path.join(OUTPUT_DIR, "partitions")
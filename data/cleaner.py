@@ -2,9 +2,11 @@ import pandas as pd
 from typing import Optional
 from utils.logger import get_logger
 from utils.helpers import safe_str
+from utils.profiler import profile_stage
 
 logger = get_logger(__name__)
 
+@profile_stage("clean")
 def clean_data(df: pd.DataFrame) -> Optional[pd.DataFrame]:
     """Clean and preprocess raw retail data."""
     try:
@@ -0,0 +1,156 @@
+import gzip
+import itertools
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+import pandas as pd
+from utils.logger import get_logger
+from config import EXPORT_CHUNK_SIZE, EXPORT_COMPRESSION
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:  # Columnar formats are optional
+    pa = None
+
+logger = get_logger(__name__)
+
+EXPORT_FORMATS = {
+    'csv': '.csv',
+    'csv.gz': '.csv.gz',
+    'parquet': '.parquet',
+    'feather': '.arrow',
+}
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="export")
+
+
+class ExportResult:
+    """Outcome and throughput of a single table export."""
+
+    def __init__(self, path: str, rows: int, bytes_written: int, seconds: float):
+        self.path = path
+        self.rows = rows
+        self.bytes_written = bytes_written
+        self.seconds = seconds
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float('inf')
+
+    @property
+    def mb_per_second(self) -> float:
+        mb = self.bytes_written / (1024 * 1024)
+        return mb / self.seconds if self.seconds > 0 else float('inf')
+
+    def __str__(self):
+        return (f"Exported {self.rows:,} rows ({self.bytes_written / (1024 * 1024):.2f} MB) "
+                f"to {self.path} in {self.seconds:.2f}s - "
+                f"{self.rows_per_second:,.0f} rows/s, {self.mb_per_second:.1f} MB/s")
+
+
+def _with_key(df: pd.DataFrame, index_label: str) -> pd.DataFrame:
+    """Move a meaningful index (e.g. Customer ID) into a regular column."""
+    if isinstance(df.index, pd.RangeIndex) and df.index.name is None:
+        return df
+    return df.reset_index(names=df.index.name or index_label)
+
+
+def _chunks(df: pd.DataFrame, chunk_size: int, index_label: str):
+    for start in range(0, len(df), chunk_size):
+        yield _with_key(df.iloc[start:start + chunk_size], index_label)
+
+
+def _open_text(path, compress):
+    if compress:
+        # Level 6 is several times faster than gzip's default 9 for a few % larger files
+        return gzip.open(path, 'wt', encoding='utf-8', newline='', compresslevel=6)
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+def _write_csv(df, path, chunk_size, index_label, compress):
+    with _open_text(path, compress) as f:
+        if len(df) == 0:
+            _with_key(df, index_label).to_csv(f, index=False)
+        for i, chunk in enumerate(_chunks(df, chunk_size, index_label)):
+            chunk.to_csv(f, header=(i == 0), index=False)
+
+
+def _arrow_schema(frame: pd.DataFrame):
+    """Arrow schema of a sample frame, with all-missing columns typed as strings.
+
+    Object columns with no values (e.g. an empty table on pandas < 3) infer
+    as ``null``, which every later chunk holding real keys would fail to fit.
+    """
+    schema = pa.Schema.from_pandas(frame, preserve_index=False)
+    for i, field in enumerate(schema):
+        if pa.types.is_null(field.type):
+            schema = schema.set(i, field.with_type(pa.string()))
+    return schema
+
+
+def _write_arrow(df, path, chunk_size, index_label, fmt):
+    if pa is None:
+        raise ImportError(f"Exporting as {fmt} requires pyarrow (pip install pyarrow)")
+
+    chunks = _chunks(df, chunk_size, index_label)
+    first = next(chunks, None)
+    schema = _arrow_schema(first if first is not None else _with_key(df, index_label))
+    if fmt == 'parquet':
+        writer = pq.ParquetWriter(path, schema, compression=EXPORT_COMPRESSION)
+    else:
+        options = pa_ipc.IpcWriteOptions(compression=EXPORT_COMPRESSION)
+        writer = pa_ipc.new_file(path, schema, options=options)
+
+    with writer:
+        if first is None:
+            return
+        for chunk in itertools.chain([first], chunks):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def export_table(df: pd.DataFrame, path_stem: str, fmt: str = 'csv',
+                 chunk_size: int = EXPORT_CHUNK_SIZE,
+                 index_label: str = 'Customer ID') -> ExportResult:
+    """Write a table in chunks to ``path_stem`` + the format's extension.
+
+    The index is written as a column whenever it carries information, so
+    RFM and prediction tables keep their customer key. Data is written to a
+    temporary file and renamed into place once complete.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format '{fmt}', choose from {list(EXPORT_FORMATS)}")
+
+    path = path_stem + EXPORT_FORMATS[fmt]
+    tmp_path = path + ".part"
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    chunk_size = max(1, chunk_size)
+
+    start = time.perf_counter()
+    try:
+        if fmt in ('csv', 'csv.gz'):
+            _write_csv(df, tmp_path, chunk_size, index_label, compress=(fmt == 'csv.gz'))
+        else:
+            _write_arrow(df, tmp_path, chunk_size, index_label, fmt)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    result = ExportResult(path, len(df), os.path.getsize(path), time.perf_counter() - start)
+    logger.info(str(result))
+    return result
+
+
+def export_async(df: pd.DataFrame, path_stem: str, fmt: str = 'csv',
+                 chunk_size: int = EXPORT_CHUNK_SIZE,
+                 index_label: str = 'Customer ID') -> Future:
+    """Run :func:`export_table` on the background export thread."""
+    return _executor.submit(export_table, df, path_stem, fmt, chunk_size, index_label)
+
+
+def available_formats() -> list:
+    """Formats usable with the installed libraries."""
+    return [fmt for fmt in EXPORT_FORMATS if pa is not None or fmt.startswith('csv')]
+
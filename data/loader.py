@@ -1,21 +1,59 @@
 import os
 import pandas as pd
 import numpy as np
-from typing import Optional
+from pandas.api.types import union_categoricals
+from typing import List, Optional
 from utils.logger import get_logger
+from utils.profiler import profile_stage
 from config import DATA_PATH, ENCODING, SAMPLE_SIZE
 
 logger = get_logger(__name__)
 
-def load_raw_data(file_path: Optional[str] = None) -> Optional[pd.DataFrame]:
-    """Load and validate dataset from CSV."""
+# Repetitive text columns stored as categoricals when reading in chunks
+CATEGORY_COLUMNS = ['Invoice', 'StockCode', 'Description', 'Country']
+
+
+def _compact_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Shrink one parsed block before the next is read."""
+    for col in CATEGORY_COLUMNS:
+        if col in chunk.columns:
+            chunk[col] = chunk[col].astype('category')
+    if 'InvoiceDate' in chunk.columns:
+        chunk['InvoiceDate'] = pd.to_datetime(chunk['InvoiceDate'], errors='coerce')
+    return chunk
+
+
+def _concat_chunks(chunks: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate compacted blocks without expanding their categoricals."""
+    for col in CATEGORY_COLUMNS:
+        if col in chunks[0].columns:
+            # Blocks must share categories or concat falls back to object
+            categories = union_categoricals([chunk[col] for chunk in chunks]).categories
+            for chunk in chunks:
+                chunk[col] = chunk[col].cat.set_categories(categories)
+    return pd.concat(chunks, ignore_index=True)
+
+
+@profile_stage("load")
+def load_raw_data(file_path: Optional[str] = None, chunk_size: Optional[int] = None) -> Optional[pd.DataFrame]:
+    """Load and validate dataset from CSV.
+
+    With ``chunk_size`` the file is parsed in blocks of that many rows and
+    each block is compacted as it arrives (repetitive text columns become
+    categoricals, invoice dates are parsed), so the full table is never
+    held as Python string objects.
+    """
     try:
         final_path = file_path or DATA_PATH
         if not final_path or not os.path.exists(final_path):
             raise FileNotFoundError(f"File not found: {final_path}")
             
         logger.info(f"Loading data from: {final_path}")
-        df = pd.read_csv(final_path, encoding=ENCODING)
+        if chunk_size:
+            reader = pd.read_csv(final_path, encoding=ENCODING, chunksize=chunk_size)
+            df = _concat_chunks([_compact_chunk(chunk) for chunk in reader])
+        else:
+            df = pd.read_csv(final_path, encoding=ENCODING)
         
         if len(df) < 1000:
             raise ValueError("Dataset too small")
@@ -1,9 +1,14 @@
 import pandas as pd
 from utils.logger import get_logger
 from utils.helpers import safe_str
+from utils.profiler import profile_stage
 
 logger = get_logger(__name__)
 
+SEGMENT_QUANTILES = [0, 0.4, 0.8, 1]
+SEGMENT_LABELS = ['Bronze', 'Silver', 'Gold']
+
+@profile_stage("rfm")
 def calculate_rfm(df):
     """Enhanced RFM calculation with validation."""
     try:
@@ -36,11 +41,16 @@ def calculate_rfm(df):
         logger.info(f"Calculated RFM metrics for {len(rfm)} customers")
         rfm['Segment'] = pd.qcut(
         rfm['CLV'],
-        q=[0, 0.4, 0.8, 1],
-        labels=['Bronze', 'Silver', 'Gold']
+        q=SEGMENT_QUANTILES,
+        labels=SEGMENT_LABELS
         )
         return rfm
         
     except Exception as e:
         logger.error(f"RFM calculation failed: {safe_str(e)}")
-        return None
\ No newline at end of file
+        return None
+
+def segment_boundaries(rfm) -> dict:
+    """Lower CLV bound of each segment above the first."""
+    edges = rfm['CLV'].quantile(SEGMENT_QUANTILES[1:-1]).tolist()
+    return dict(zip(SEGMENT_LABELS[1:], edges))
\ No newline at end of file
@@ -0,0 +1,86 @@
+import hashlib
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import KDTree
+from typing import Iterable, Optional
+from utils.logger import get_logger
+from utils.helpers import safe_str, data_fingerprint
+from utils.profiler import profile_stage
+from models.trainer import FEATURE_COLUMNS
+
+logger = get_logger(__name__)
+
+
+class LookalikeIndex:
+    """KD-tree over the scaled RFM features for "find similar customers".
+
+    The tree is built once; each query is a single batched k-NN call.
+    Features are scaled with the same ``StandardScaler`` that
+    ``prepare_data`` fits for the model.
+    """
+
+    def __init__(self, rfm: pd.DataFrame, scaler, leaf_size: int = 40):
+        self.customer_ids = pd.Index(rfm.index)
+        self.features = np.ascontiguousarray(scaler.transform(rfm[FEATURE_COLUMNS]))
+        self.tree = KDTree(self.features, leaf_size=leaf_size)
+
+    def __len__(self) -> int:
+        return len(self.customer_ids)
+
+    def query(self, customer_ids: Iterable, k: int = 5) -> pd.DataFrame:
+        """The ``k`` nearest other customers of each requested customer.
+
+        Returns one row per (customer, neighbour) with the neighbour's rank
+        and its distance in scaled feature space. Unknown IDs raise KeyError.
+        """
+        customer_ids = list(customer_ids)
+        positions = self.customer_ids.get_indexer(customer_ids)
+        if (positions < 0).any():
+            unknown = [c for c, p in zip(customer_ids, positions) if p < 0]
+            raise KeyError(f"Unknown customers: {unknown[:5]}")
+
+        if len(self) < 2:
+            raise ValueError("Need at least two customers to find lookalikes")
+        k = max(1, min(k, len(self) - 1))
+        # Ask for one extra neighbour since each customer finds itself
+        distances, neighbours = self.tree.query(self.features[positions], k=k + 1)
+
+        is_self = neighbours == positions[:, None]
+        # Drop the self match, or the farthest neighbour if a duplicate point displaced it
+        drop = np.where(is_self.any(axis=1), is_self.argmax(axis=1), k)
+        keep = np.ones_like(neighbours, dtype=bool)
+        keep[np.arange(len(positions)), drop] = False
+        neighbours = neighbours[keep].reshape(len(positions), k)
+        distances = distances[keep].reshape(len(positions), k)
+
+        return pd.DataFrame({
+            'Customer ID': np.repeat(np.asarray(customer_ids, dtype=object), k),
+            'Rank': np.tile(np.arange(1, k + 1), len(positions)),
+            'Lookalike': self.customer_ids.to_numpy()[neighbours.ravel()],
+            'Distance': distances.ravel(),
+        })
+
+
+@profile_stage("lookalike_index")
+def build_lookalike_index(rfm: pd.DataFrame, scaler) -> Optional[LookalikeIndex]:
+    """Build the nearest-neighbour index over all customers."""
+    try:
+        logger.info(f"Building lookalike index over {len(rfm)} customers")
+        return LookalikeIndex(rfm, scaler)
+    except Exception as e:
+        logger.error(f"Lookalike index build failed: {safe_str(e)}")
+        return None
+
+
+def cached_lookalike_index(rfm: pd.DataFrame, scaler) -> Optional[LookalikeIndex]:
+    """:func:`build_lookalike_index`, reused for the same features and scaler."""
+    from pipeline.store import cached_build
+    try:
+        digest = hashlib.sha256(data_fingerprint(rfm[FEATURE_COLUMNS]).encode('utf-8'))
+        digest.update(np.asarray(scaler.mean_).tobytes())
+        digest.update(np.asarray(scaler.scale_).tobytes())
+    except Exception as e:
+        logger.error(f"Lookalike index build failed: {safe_str(e)}")
+        return None
+    return cached_build("lookalike_index", digest.hexdigest(),
+                        lambda: build_lookalike_index(rfm, scaler))
@@ -0,0 +1,215 @@
+import json
+import os
+import shutil
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+import numpy as np
+import pandas as pd
+from utils.helpers import atomic_write, data_fingerprint
+from utils.logger import get_logger
+from config import FEATURE_STORE_DIR, FEATURE_STORE_KEEP
+
+logger = get_logger(__name__)
+
+# Column name -> on-disk dtype
+FEATURE_DTYPES = {
+    'Recency': np.int32,
+    'Frequency': np.int32,
+    'Monetary': np.float64,
+    'AvgOrderValue': np.float64,
+    'PurchaseInterval': np.float64,
+    'CLV': np.float64,
+}
+OPTIONAL_DTYPES = {'PredictedCLV': np.float64}
+
+
+def _encode_keys(keys: Iterable) -> np.ndarray:
+    """Customer IDs as a fixed-width byte array (unicode if not ASCII)."""
+    keys = np.asarray([str(k) for k in keys], dtype=str)
+    try:
+        return np.char.encode(keys, 'ascii')
+    except UnicodeEncodeError:
+        return keys
+
+
+class FeatureSnapshot:
+    """Read-only, memory-mapped view of one published feature snapshot.
+
+    Every column is a contiguous ``.npy`` array opened with ``mmap_mode='r'``,
+    so any number of processes share the same pages without copying. Rows are
+    sorted by customer key, which makes lookups a binary search.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "meta.json"), encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self.snapshot_id = self.meta['snapshot_id']
+        self.keys = np.load(os.path.join(path, "keys.npy"), mmap_mode='r')
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r')
+            for name in self.meta['columns']
+        }
+        self.segment_labels = self.meta.get('segment_labels')
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def column(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def positions(self, customer_ids: Iterable) -> np.ndarray:
+        """Row positions for a batch of customer IDs; -1 where unknown."""
+        queries = np.asarray([str(c) for c in customer_ids], dtype=str)
+        if len(self.keys) == 0:
+            return np.full(len(queries), -1, dtype=np.int64)
+        if self.keys.dtype.kind == 'S':
+            try:
+                queries = np.char.encode(queries, 'ascii')
+            except UnicodeEncodeError:
+                return np.full(len(queries), -1, dtype=np.int64)
+        pos = np.searchsorted(self.keys, queries)
+        pos = np.minimum(pos, len(self.keys) - 1)
+        return np.where(self.keys[pos] == queries, pos, -1).astype(np.int64)
+
+    def get(self, customer_id) -> Optional[dict]:
+        """Feature values of one customer, or None if not in the snapshot."""
+        pos = self.positions([customer_id])[0]
+        if pos < 0:
+            return None
+        row = {name: col[pos].item() for name, col in self.columns.items()}
+        if 'Segment' in row and self.segment_labels:
+            row['Segment'] = self.segment_labels[row['Segment']] if row['Segment'] >= 0 else None
+        return row
+
+    def to_frame(self, customer_ids: Optional[Iterable] = None) -> pd.DataFrame:
+        """Materialise all rows, or only the requested customers, as a DataFrame."""
+        if customer_ids is None:
+            index = slice(None)
+            keys = self.keys
+        else:
+            pos = self.positions(customer_ids)
+            index = pos[pos >= 0]
+            keys = self.keys[index]
+        if keys.dtype.kind == 'S':
+            keys = np.char.decode(keys, 'ascii')
+
+        df = pd.DataFrame({name: np.asarray(col[index]) for name, col in self.columns.items()},
+                          index=pd.Index(keys, name='Customer ID'))
+        if 'Segment' in df and self.segment_labels:
+            df['Segment'] = pd.Categorical.from_codes(df['Segment'], self.segment_labels)
+        return df
+
+
+class FeatureStore:
+    """Publishes RFM snapshots as columnar arrays and serves the current one.
+
+    Snapshots are written to their own directory and become visible by
+    atomically replacing the ``CURRENT`` pointer file, so readers either see
+    the previous snapshot or the complete new one, never a partial write.
+    """
+
+    def __init__(self, root: str = FEATURE_STORE_DIR):
+        self.root = root
+        self.snapshots_dir = os.path.join(root, "snapshots")
+        self.pointer_path = os.path.join(root, "CURRENT")
+
+    def current_id(self) -> Optional[str]:
+        if not os.path.exists(self.pointer_path):
+            return None
+        with open(self.pointer_path, encoding='utf-8') as f:
+            return f.read().strip() or None
+
+    def open(self, snapshot_id: Optional[str] = None) -> Optional[FeatureSnapshot]:
+        """Map the given snapshot, or the current one, read-only."""
+        snapshot_id = snapshot_id or self.current_id()
+        if snapshot_id is None:
+            return None
+        return FeatureSnapshot(os.path.join(self.snapshots_dir, snapshot_id))
+
+    def publish(self, rfm: pd.DataFrame, predictions: Optional[pd.Series] = None) -> Optional[str]:
+        """Write a new snapshot of the RFM table and make it current.
+
+        If the table is identical to the current snapshot's, nothing is
+        written and the current snapshot ID is returned.
+        """
+        tmp_dir = None
+        try:
+            table = rfm.join(predictions) if predictions is not None else rfm
+            missing = [col for col in FEATURE_DTYPES if col not in table.columns]
+            if missing:
+                raise ValueError(f"Missing feature columns: {missing}")
+
+            digest = data_fingerprint(table)
+            current = self.current_id()
+            if current is not None and self._snapshot_digest(current) == digest:
+                logger.info(f"Feature snapshot {current} is already up to date")
+                return current
+
+            snapshot_id = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+            tmp_dir = os.path.join(self.snapshots_dir, f".tmp-{snapshot_id}")
+            os.makedirs(tmp_dir)
+
+            keys = _encode_keys(table.index)
+            order = np.argsort(keys, kind='stable')
+            np.save(os.path.join(tmp_dir, "keys.npy"), keys[order])
+
+            dtypes = dict(FEATURE_DTYPES)
+            dtypes.update({col: dt for col, dt in OPTIONAL_DTYPES.items() if col in table.columns})
+            for col, dtype in dtypes.items():
+                values = table[col].to_numpy(dtype=dtype)[order]
+                np.save(os.path.join(tmp_dir, f"{col}.npy"), np.ascontiguousarray(values))
+
+            meta = {
+                'snapshot_id': snapshot_id,
+                'created_at': datetime.now().isoformat(timespec='seconds'),
+                'rows': int(len(table)),
+                'columns': list(dtypes),
+                'digest': digest,
+            }
+            if 'Segment' in table.columns:
+                segments = table['Segment'].astype('category')
+                np.save(os.path.join(tmp_dir, "Segment.npy"),
+                        segments.cat.codes.to_numpy(dtype=np.int8)[order])
+                meta['columns'].append('Segment')
+                meta['segment_labels'] = [str(c) for c in segments.cat.categories]
+
+            with open(os.path.join(tmp_dir, "meta.json"), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, indent=2)
+
+            os.rename(tmp_dir, os.path.join(self.snapshots_dir, snapshot_id))
+            atomic_write(self.pointer_path, snapshot_id.encode('utf-8'))
+            logger.info(f"Published feature snapshot {snapshot_id} ({len(table)} customers)")
+
+            self.prune()
+            return snapshot_id
+
+        except Exception as e:
+            logger.error(f"Feature store publish failed: {e}")
+            if tmp_dir is not None:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+            return None
+
+    def _snapshot_digest(self, snapshot_id: str) -> Optional[str]:
+        try:
+            with open(os.path.join(self.snapshots_dir, snapshot_id, "meta.json"), encoding='utf-8') as f:
+                return json.load(f).get('digest')
+        except (OSError, ValueError):
+            return None
+
+    def prune(self, keep: int = FEATURE_STORE_KEEP):
+        """Remove all but the newest ``keep`` snapshots; never the current one."""
+        if not os.path.isdir(self.snapshots_dir):
+            return
+        current = self.current_id()
+        snapshots = sorted(
+            (name for name in os.listdir(self.snapshots_dir) if not name.startswith('.')),
+            reverse=True
+        )
+        for name in snapshots[max(1, keep):]:
+            if name == current:
+                continue
+            try:
+                shutil.rmtree(os.path.join(self.snapshots_dir, name))
+            except OSError as e:  # Still mapped by a reader on some platforms
+                logger.warning(f"Could not remove snapshot {name}: {e}")
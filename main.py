@@ -1,5 +1,10 @@
-from ui.main_window import MainApplication
+import sys
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        from cli import main
+        sys.exit(main())
+
+    from ui.main_window import MainApplication
     app = MainApplication()
     app.mainloop()
\ No newline at end of file
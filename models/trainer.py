@@ -5,16 +5,20 @@ from sklearn.preprocessing import StandardScaler
 from typing import Tuple, Optional
 from utils.logger import get_logger
 from utils.helpers import safe_str
-from config import RANDOM_STATE, TEST_SIZE, N_ESTIMATORS, MAX_DEPTH, MIN_SAMPLES_SPLIT
+from utils.profiler import profile_stage
+from config import RANDOM_STATE, TEST_SIZE, N_ESTIMATORS, MAX_DEPTH, MIN_SAMPLES_SPLIT, N_JOBS
 
 logger = get_logger(__name__)
 
+FEATURE_COLUMNS = ['Recency', 'Frequency', 'Monetary', 'AvgOrderValue', 'PurchaseInterval']
+
+@profile_stage("prepare")
 def prepare_data(rfm: pd.DataFrame) -> Tuple:
     """Prepare data for modeling."""
     try:
         logger.info("Preparing data for modeling")
         
-        X = rfm[['Recency', 'Frequency', 'Monetary', 'AvgOrderValue', 'PurchaseInterval']]
+        X = rfm[FEATURE_COLUMNS]
         y = rfm['CLV']
         
         X_train, X_test, y_train, y_test = train_test_split(
@@ -31,7 +35,8 @@ def prepare_data(rfm: pd.DataFrame) -> Tuple:
         logger.error(f"Error preparing data: {safe_str(e)}")
         return None
 
-def train_model(X_train, y_train) -> Optional[RandomForestRegressor]:
+@profile_stage("train")
+def train_model(X_train, y_train, n_jobs: Optional[int] = None) -> Optional[RandomForestRegressor]:
     """Train Random Forest model."""
     try:
         logger.info("Training Random Forest model")
@@ -41,7 +46,7 @@ def train_model(X_train, y_train) -> Optional[RandomForestRegressor]:
             max_depth=MAX_DEPTH,
             min_samples_split=MIN_SAMPLES_SPLIT,
             random_state=RANDOM_STATE,
-            n_jobs=-1,
+            n_jobs=N_JOBS if n_jobs is None else n_jobs,
             verbose=1
         )
         
@@ -51,4 +56,25 @@ def train_model(X_train, y_train) -> Optional[RandomForestRegressor]:
         
     except Exception as e:
         logger.error(f"Error training model: {safe_str(e)}")
-        return None
\ No newline at end of file
+        return None
+
+@profile_stage("score")
+def predict_clv(rfm: pd.DataFrame, model, scaler) -> Optional[pd.Series]:
+    """Score every customer in the RFM table with a trained model."""
+    try:
+        logger.info(f"Scoring {len(rfm)} customers")
+        X = scaler.transform(rfm[FEATURE_COLUMNS])
+        return pd.Series(model.predict(X), index=rfm.index, name='PredictedCLV')
+        
+    except Exception as e:
+        logger.error(f"Error scoring customers: {safe_str(e)}")
+        return None
+
+def feature_importance(model) -> Optional[pd.DataFrame]:
+    """Feature importances of a trained model, highest first."""
+    if not hasattr(model, 'feature_importances_'):
+        return None
+    return pd.DataFrame({
+        'Feature': FEATURE_COLUMNS,
+        'Importance': model.feature_importances_
+    }).sort_values('Importance', ascending=False, ignore_index=True)
\ No newline at end of file
@@ -0,0 +1,212 @@
+import hashlib
+import inspect
+import json
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import config
+from pipeline.store import ArtifactStore
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class StageFailed(Exception):
+    """Raised when a pipeline stage returns no result."""
+
+
+class Stage:
+    """One node of the pipeline.
+
+    ``inputs`` name upstream stages whose outputs are passed positionally to
+    ``func``; ``optional_inputs`` are passed as keyword arguments only when
+    those stages are part of the run. ``config_keys`` and ``params`` feed the
+    cache key alongside the upstream digests and the source of the modules
+    defining ``code`` (defaults to ``func``; list the real functions when
+    ``func`` is a wrapper).
+    Non-cacheable stages (side effects only) always run when selected, and
+    ``materialize`` is called with a cached output to restore side effects.
+    Source stages are keyed by their params alone (e.g. a file fingerprint)
+    and are only executed when a downstream stage needs their output.
+    """
+
+    def __init__(self, name: str, func: Callable, inputs: Sequence[str] = (),
+                 optional_inputs: Sequence[str] = (), config_keys: Sequence[str] = (),
+                 params: Optional[Dict[str, Any]] = None, cacheable: bool = True,
+                 materialize: Optional[Callable[[Any], None]] = None, source: bool = False,
+                 code: Sequence[Callable] = ()):
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.optional_inputs = list(optional_inputs)
+        self.config_keys = list(config_keys)
+        self.params = params or {}
+        self.cacheable = cacheable
+        self.materialize = materialize
+        self.source = source
+        self.code = list(code) or [func]
+
+    def code_hash(self) -> str:
+        """Hash the source of the modules defining ``code``.
+
+        Whole modules are hashed rather than single functions so edits to
+        module-level constants (quantiles, feature lists) invalidate the stage.
+        """
+        digest = hashlib.sha256()
+        seen = set()
+        for func in self.code:
+            func = inspect.unwrap(func)
+            target = inspect.getmodule(func) or func
+            if id(target) in seen:
+                continue
+            seen.add(id(target))
+            try:
+                source = inspect.getsource(target)
+            except (OSError, TypeError):
+                source = getattr(func, '__qualname__', type(func).__name__)
+            digest.update(source.encode('utf-8'))
+        return digest.hexdigest()
+
+    def action_key(self, input_digests: Dict[str, str]) -> str:
+        """Hash of everything that determines this stage's output."""
+        payload = {
+            'stage': self.name,
+            'code': self.code_hash(),
+            'inputs': input_digests,
+            'config': {key: repr(getattr(config, key)) for key in self.config_keys},
+            'params': {key: repr(value) for key, value in sorted(self.params.items())},
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class PlanStep:
+    def __init__(self, stage: str, action: str, key: Optional[str] = None):
+        self.stage = stage
+        self.action = action  # "cached", "run" or "pending" (depends on upstream output)
+        self.key = key
+
+    def __repr__(self):
+        return f"{self.stage}: {self.action}" + (f" ({self.key[:12]})" if self.key else "")
+
+
+class Pipeline:
+    """Memoized stage DAG backed by an :class:`ArtifactStore`."""
+
+    def __init__(self, stages: Sequence[Stage], store: ArtifactStore):
+        self.stages = {stage.name: stage for stage in stages}
+        self.order = [stage.name for stage in stages]
+        self.store = store
+
+    def resolve(self, targets: Sequence[str]) -> List[str]:
+        """Expand targets with their required inputs, in declaration order."""
+        selected = set()
+
+        def add(name):
+            if name not in self.stages:
+                raise KeyError(f"Unknown stage: {name}")
+            if name not in selected:
+                selected.add(name)
+                for dep in self.stages[name].inputs:
+                    add(dep)
+
+        for target in targets:
+            add(target)
+        return [name for name in self.order if name in selected]
+
+    def _input_names(self, stage: Stage, selected: Sequence[str]) -> List[str]:
+        return stage.inputs + [name for name in stage.optional_inputs if name in selected]
+
+    def plan(self, targets: Sequence[str]) -> List[PlanStep]:
+        """Work out which stages would run without executing anything."""
+        selected = self.resolve(targets)
+        digests: Dict[str, Optional[str]] = {}
+        steps = []
+
+        for name in selected:
+            stage = self.stages[name]
+            upstream = {dep: digests.get(dep) for dep in self._input_names(stage, selected)}
+            if stage.source:
+                digests[name] = stage.action_key({})
+                steps.append(PlanStep(name, "cached", digests[name]))
+                continue
+            if not stage.cacheable:
+                digests[name] = None
+                steps.append(PlanStep(name, "run"))
+                continue
+            if any(d is None for d in upstream.values()):
+                # Upstream recomputes; this stage is skipped if that output is unchanged
+                digests[name] = None
+                steps.append(PlanStep(name, "pending"))
+                continue
+
+            key = stage.action_key(upstream)
+            digests[name] = self.store.lookup(key)
+            steps.append(PlanStep(name, "cached" if digests[name] else "run", key))
+
+        # A source stage executes only if something reading it has to run
+        running = {step.stage for step in steps if step.action != "cached"}
+        for step in steps:
+            if self.stages[step.stage].source and any(
+                    step.stage in self._input_names(self.stages[other], selected) for other in running):
+                step.action = "run"
+        return steps
+
+    def run(self, targets: Sequence[str], force: bool = False) -> Dict[str, Any]:
+        """Execute the selected stages, reusing cached outputs where inputs match.
+
+        Cached outputs are only loaded from disk when a downstream stage that
+        actually runs needs them. Returns the outputs that were loaded or computed.
+        """
+        selected = self.resolve(targets)
+        digests: Dict[str, Optional[str]] = {}
+        values: Dict[str, Any] = {}
+
+        def value_of(name):
+            if name not in values:
+                if self.stages[name].source:
+                    logger.info(f"Running stage '{name}'")
+                    values[name] = self._execute(self.stages[name], [], {})
+                else:
+                    values[name] = self.store.get(digests[name])
+            return values[name]
+
+        for name in selected:
+            stage = self.stages[name]
+            input_names = self._input_names(stage, selected)
+            upstream = {dep: digests[dep] for dep in input_names}
+            key = None
+
+            if stage.source:
+                digests[name] = stage.action_key({})
+                continue
+
+            if stage.cacheable and not force and all(upstream.values()):
+                key = stage.action_key(upstream)
+                digest = self.store.lookup(key)
+                if digest:
+                    logger.info(f"Stage '{name}' up to date ({digest[:12]})")
+                    digests[name] = digest
+                    self.store.touch(key)
+                    if stage.materialize is not None:
+                        stage.materialize(value_of(name))
+                    continue
+
+            logger.info(f"Running stage '{name}'")
+            args = [value_of(dep) for dep in stage.inputs]
+            kwargs = {dep: value_of(dep) for dep in stage.optional_inputs if dep in input_names}
+            result = self._execute(stage, args, kwargs)
+
+            values[name] = result
+            if stage.cacheable:
+                digests[name] = self.store.put(result)
+                if all(upstream.values()):
+                    self.store.record(key or stage.action_key(upstream), name, digests[name])
+            else:
+                digests[name] = None
+
+        return values
+
+    @staticmethod
+    def _execute(stage: Stage, args: list, kwargs: dict) -> Any:
+        result = stage.func(*args, **kwargs)
+        if result is None or result is False:
+            raise StageFailed(f"Stage '{stage.name}' failed - check the log for details")
+        return result
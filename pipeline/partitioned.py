@@ -0,0 +1,206 @@
+"""Per-partition RFM, segmentation and model training.
+
+Cleaned transactions are split by a key column (Country by default) and each
+partition is processed in its own worker process. Partitions are submitted
+largest first so a dominant market starts immediately instead of running
+alone at the end while the other cores sit idle.
+"""
+import json
+import os
+import pickle
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from config import PARTITION_KEY, PARTITION_MIN_CUSTOMERS, PARTITION_DIR, N_JOBS
+from utils.helpers import safe_str
+from utils.logger import get_logger
+from utils.profiler import profile_stage, start_run
+
+logger = get_logger(__name__)
+
+# Partition holding rows whose key is missing
+UNKNOWN_PARTITION = "(unknown)"
+
+
+class PartitionResult:
+    """RFM table, segment boundaries and (optionally) model for one partition."""
+
+    def __init__(self, key: str, rows: int):
+        self.key = key
+        self.rows = rows
+        self.status = "ok"
+        self.message = ""
+        self.rfm: Optional[pd.DataFrame] = None
+        self.boundaries: Dict[str, float] = {}
+        self.model = None
+        self.scaler = None
+        self.seconds = 0.0
+
+    @property
+    def customers(self) -> int:
+        return 0 if self.rfm is None else len(self.rfm)
+
+    def summary(self) -> dict:
+        return {
+            'key': self.key,
+            'status': self.status,
+            'message': self.message,
+            'rows': self.rows,
+            'customers': self.customers,
+            'boundaries': self.boundaries,
+            'has_model': self.model is not None,
+            'seconds': round(self.seconds, 3),
+        }
+
+
+class PartitionRegistry:
+    """Collected per-partition outputs, keyed by partition value."""
+
+    def __init__(self, partition_key: str):
+        self.partition_key = partition_key
+        self.results: Dict[str, PartitionResult] = {}
+
+    def add(self, result: PartitionResult):
+        self.results[result.key] = result
+
+    def get(self, key: str) -> Optional[PartitionResult]:
+        return self.results.get(key)
+
+    def __len__(self):
+        return len(self.results)
+
+    def combined_rfm(self) -> pd.DataFrame:
+        """All partitions' RFM rows with the partition value as a column."""
+        frames = [r.rfm.assign(**{self.partition_key: key})
+                  for key, r in self.results.items() if r.rfm is not None]
+        return pd.concat(frames) if frames else pd.DataFrame()
+
+    def predict(self, key: str, rfm: pd.DataFrame) -> Optional[pd.Series]:
+        """Score customers with the model trained for ``key``."""
+        from models.trainer import predict_clv
+        result = self.get(key)
+        if result is None or result.model is None:
+            return None
+        return predict_clv(rfm, result.model, result.scaler)
+
+    def save(self, directory: str = PARTITION_DIR) -> str:
+        """Write a JSON summary and one pickle per partition."""
+        os.makedirs(directory, exist_ok=True)
+        summaries = []
+        for key, result in self.results.items():
+            entry = result.summary()
+            entry['file'] = f"{re.sub(r'[^A-Za-z0-9_.-]+', '_', key)}.pkl"
+            with open(os.path.join(directory, entry['file']), 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            summaries.append(entry)
+
+        registry_path = os.path.join(directory, "registry.json")
+        with open(registry_path, 'w', encoding='utf-8') as f:
+            json.dump({'partition_key': self.partition_key, 'partitions': summaries}, f, indent=2)
+        logger.info(f"Saved {len(summaries)} partitions to {registry_path}")
+        return registry_path
+
+    @classmethod
+    def load(cls, directory: str = PARTITION_DIR) -> 'PartitionRegistry':
+        with open(os.path.join(directory, "registry.json"), encoding='utf-8') as f:
+            manifest = json.load(f)
+        registry = cls(manifest['partition_key'])
+        for entry in manifest['partitions']:
+            with open(os.path.join(directory, entry['file']), 'rb') as f:
+                registry.add(pickle.load(f))
+        return registry
+
+
+def _init_worker():
+    # Keep per-stage profiling in workers from overwriting the parent's report
+    start_run("partition-worker", persist=False)
+
+
+def process_partition(key: str, transactions: pd.DataFrame,
+                      min_customers: int = PARTITION_MIN_CUSTOMERS) -> PartitionResult:
+    """RFM, segment boundaries and a single-threaded model for one partition."""
+    from features.rfm import calculate_rfm, segment_boundaries
+    from models.trainer import prepare_data, train_model
+
+    start = time.perf_counter()
+    result = PartitionResult(key, len(transactions))
+    try:
+        result.rfm = calculate_rfm(transactions)
+        if result.rfm is None:
+            result.status, result.message = "failed", "RFM calculation failed"
+            return result
+
+        result.boundaries = segment_boundaries(result.rfm)
+        if len(result.rfm) < min_customers:
+            result.status = "no_model"
+            result.message = f"{len(result.rfm)} customers, below minimum of {min_customers}"
+            return result
+
+        prepared = prepare_data(result.rfm)
+        if prepared is None:
+            result.status, result.message = "failed", "Data preparation failed"
+            return result
+        X_train, _, y_train, _, result.scaler = prepared
+        # One thread per model; parallelism comes from running partitions side by side
+        result.model = train_model(X_train, y_train, n_jobs=1)
+        if result.model is None:
+            result.status, result.message = "failed", "Model training failed"
+        return result
+    except Exception as e:
+        result.status, result.message = "failed", safe_str(e)
+        return result
+    finally:
+        result.seconds = time.perf_counter() - start
+
+
+def split_partitions(df: pd.DataFrame, key: str) -> List[tuple]:
+    """(value, rows) pairs ordered largest partition first.
+
+    Rows with no key value form their own :data:`UNKNOWN_PARTITION` instead
+    of silently dropping out of the partitioned results.
+    """
+    groups = {safe_str(value): positions
+              for value, positions in df.groupby(key, sort=False, observed=True).indices.items()}
+    # groupby(dropna=False) still drops NaN from .indices for categorical keys
+    missing = np.flatnonzero(df[key].isna().to_numpy())
+    if len(missing):
+        logger.warning(f"{len(missing)} rows have no {key}; processing them as partition {UNKNOWN_PARTITION}")
+        groups[UNKNOWN_PARTITION] = missing
+    ordered = sorted(groups.items(), key=lambda item: len(item[1]), reverse=True)
+    return [(value, df.iloc[positions]) for value, positions in ordered]
+
+
+@profile_stage("partitioned")
+def run_partitioned(df: pd.DataFrame, key: str = PARTITION_KEY, workers: int = N_JOBS,
+                    min_customers: int = PARTITION_MIN_CUSTOMERS) -> Optional[PartitionRegistry]:
+    """Process every partition of the cleaned transactions in parallel."""
+    try:
+        if key not in df.columns:
+            raise ValueError(f"Partition column '{key}' not in data")
+
+        partitions = split_partitions(df, key)
+        n_workers = workers if workers and workers > 0 else (os.cpu_count() or 1)
+        n_workers = max(1, min(n_workers, len(partitions)))
+        logger.info(f"Processing {len(partitions)} partitions by {key} with {n_workers} workers")
+
+        registry = PartitionRegistry(key)
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker) as pool:
+            # Submission order is execution order: largest partitions first
+            futures = [pool.submit(process_partition, value, rows, min_customers)
+                       for value, rows in partitions]
+            for future in as_completed(futures):
+                result = future.result()
+                registry.add(result)
+                logger.info(f"Partition {result.key}: {result.status} "
+                            f"({result.rows} rows, {result.customers} customers, {result.seconds:.2f}s)")
+
+        # Keep the registry in largest-first order regardless of completion order
+        registry.results = {value: registry.results[value] for value, _ in partitions}
+        return registry
+
+    except Exception as e:
+        logger.error(f"Partitioned run failed: {safe_str(e)}")
+        return None
@@ -0,0 +1,123 @@
+import os
+from functools import partial
+from typing import Optional
+from config import ARTIFACT_DIR, OUTPUT_DIR, N_JOBS, EXPORT_FORMAT, PARTITION_KEY
+from pipeline.dag import Pipeline, Stage
+from pipeline.store import ArtifactStore
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+PLOT_PATH = os.path.join(OUTPUT_DIR, 'rfm_distributions.png')
+
+
+def file_fingerprint(path: str) -> dict:
+    """Cheap identity of an input file: resolved path, size and mtime."""
+    stat = os.stat(path)
+    return {'path': os.path.abspath(path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _train(prepared, n_jobs):
+    from models.trainer import train_model
+    X_train, _, y_train, _, _ = prepared
+    return train_model(X_train, y_train, n_jobs=n_jobs)
+
+
+def _score(rfm, model, prepared):
+    from models.trainer import predict_clv
+    return predict_clv(rfm, model, prepared[4])
+
+
+def _plots(rfm) -> Optional[bytes]:
+    """Render the RFM plots and keep the PNG bytes as the cached artifact."""
+    from visualization.plots import generate_rfm_plots
+    if not generate_rfm_plots(rfm):
+        return None
+    with open(PLOT_PATH, 'rb') as f:
+        return f.read()
+
+
+def _restore_plots(png: bytes):
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    with open(PLOT_PATH, 'wb') as f:
+        f.write(png)
+
+
+def _export(rfm, score=None, train=None, fmt: str = EXPORT_FORMAT) -> Optional[list]:
+    """Export the RFM/segment table (with predictions when scored) and the
+    feature importances when a model was trained."""
+    from data.exporter import export_table
+    from models.trainer import feature_importance
+    try:
+        table = rfm.join(score) if score is not None else rfm
+        results = [export_table(table, os.path.join(OUTPUT_DIR, "clv_predictions"), fmt)]
+        importance = feature_importance(train) if train is not None else None
+        if importance is not None:
+            results.append(export_table(importance, os.path.join(OUTPUT_DIR, "feature_importance"), fmt))
+        return results
+    except Exception as e:
+        logger.error(f"Export failed: {e}")
+        return None
+
+
+def _publish(rfm, score=None) -> Optional[str]:
+    """Publish the customer features as the current feature-store snapshot."""
+    from features.store import FeatureStore
+    return FeatureStore().publish(rfm, score)
+
+
+def _partitioned(clean, key, workers):
+    from pipeline.partitioned import run_partitioned
+    registry = run_partitioned(clean, key, workers)
+    if registry is not None:
+        registry.save()
+    return registry
+
+
+def _restore_partitions(registry):
+    registry.save()
+
+
+def build_clv_pipeline(input_path: Optional[str] = None, chunk_size: Optional[int] = None,
+                       workers: int = N_JOBS, use_sample: bool = False,
+                       store: Optional[ArtifactStore] = None,
+                       export_format: str = EXPORT_FORMAT,
+                       partition_key: str = PARTITION_KEY) -> Pipeline:
+    """Assemble the load -> clean -> RFM -> train/score -> plots/export/publish DAG."""
+    from data.loader import load_raw_data, create_sample_data
+    from data.cleaner import clean_data
+    from features.rfm import calculate_rfm, segment_boundaries
+    from models.trainer import prepare_data, train_model, predict_clv
+    from visualization.plots import generate_rfm_plots
+    from pipeline.partitioned import run_partitioned, process_partition
+
+    if use_sample:
+        load = Stage('load', create_sample_data, config_keys=['SAMPLE_SIZE'],
+                     params={'source': 'sample'}, source=True)
+    else:
+        load = Stage('load', partial(load_raw_data, input_path, chunk_size), code=[load_raw_data],
+                     config_keys=['ENCODING'], params=file_fingerprint(input_path), source=True)
+
+    stages = [
+        load,
+        Stage('clean', clean_data, inputs=['load']),
+        Stage('rfm', calculate_rfm, inputs=['clean']),
+        Stage('prepare', prepare_data, inputs=['rfm'], config_keys=['RANDOM_STATE', 'TEST_SIZE']),
+        Stage('train', partial(_train, n_jobs=workers), code=[_train, train_model], inputs=['prepare'],
+              config_keys=['RANDOM_STATE', 'N_ESTIMATORS', 'MAX_DEPTH', 'MIN_SAMPLES_SPLIT']),
+        Stage('score', _score, code=[_score, predict_clv], inputs=['rfm', 'train', 'prepare']),
+        Stage('plots', _plots, code=[_plots, generate_rfm_plots], inputs=['rfm'],
+              materialize=_restore_plots),
+        Stage('export', partial(_export, fmt=export_format), inputs=['rfm'],
+              optional_inputs=['score', 'train'], cacheable=False),
+        Stage('publish', _publish, inputs=['rfm'], optional_inputs=['score'], cacheable=False),
+        Stage('partitioned', partial(_partitioned, key=partition_key, workers=workers),
+              code=[_partitioned, run_partitioned, process_partition, calculate_rfm,
+                    segment_boundaries, prepare_data, train_model],
+              inputs=['clean'],
+              params={'key': partition_key},
+              config_keys=['PARTITION_MIN_CUSTOMERS', 'RANDOM_STATE', 'TEST_SIZE',
+                           'N_ESTIMATORS', 'MAX_DEPTH', 'MIN_SAMPLES_SPLIT'],
+              materialize=_restore_partitions),
+    ]
+    return Pipeline(stages, store or ArtifactStore(ARTIFACT_DIR))
@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+from utils.helpers import atomic_write, file_lock
+from utils.logger import get_logger
+from config import ANALYSIS_CACHE_DIR, ANALYSIS_CACHE_KEEP
+
+logger = get_logger(__name__)
+
+
+class ArtifactStore:
+    """Content-addressed on-disk store for stage outputs.
+
+    Objects are pickled and saved under the SHA-256 of their bytes. A small
+    action index maps each stage's input key to the digest it produced, so
+    identical inputs resolve to an existing object without recomputation.
+    Several stores (or processes) may share a root: every index update
+    re-reads the file under a lock and merges into it, and eviction only
+    deletes objects while holding that lock.
+    """
+
+    # Objects younger than this may belong to a put() whose record() is
+    # still to come in another process, so eviction leaves them alone
+    EVICT_GRACE_SECONDS = 300
+
+    def __init__(self, root: str):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.index_path = os.path.join(root, "index.json")
+        self.lock_path = os.path.join(root, ".lock")
+        self._lock = threading.Lock()
+        self._index = self._read_index()
+
+    def _read_index(self) -> Dict[str, dict]:
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path, encoding='utf-8') as f:
+                return json.load(f).get('actions', {})
+        except Exception as e:
+            logger.error(f"Artifact index unreadable, starting empty: {e}")
+            return {}
+
+    def _write_index(self):
+        payload = json.dumps({'actions': self._index}, indent=2, sort_keys=True)
+        atomic_write(self.index_path, payload.encode('utf-8'))
+
+    @contextmanager
+    def _locked_index(self):
+        """Lock the index for other threads and processes and reload it from
+        disk, so the block's changes merge with whatever others recorded."""
+        with self._lock, file_lock(self.lock_path):
+            self._index = self._read_index()
+            yield self._index
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.pkl")
+
+    def has(self, digest: str) -> bool:
+        return os.path.exists(self._object_path(digest))
+
+    def put(self, obj: Any) -> str:
+        """Store an object and return its content digest."""
+        data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if os.path.exists(path):
+            os.utime(path)  # keep it out of a concurrent evict's reach
+        else:
+            atomic_write(path, data)
+        return digest
+
+    def get(self, digest: str) -> Any:
+        with open(self._object_path(digest), 'rb') as f:
+            return pickle.load(f)
+
+    def lookup(self, action_key: str) -> Optional[str]:
+        """Return the digest recorded for an action key if its object still exists."""
+        with self._lock:
+            entry = self._index.get(action_key)
+            if entry is None:
+                # Another store may have recorded it since we last read
+                self._index = self._read_index()
+                entry = self._index.get(action_key)
+        if entry and self.has(entry['digest']):
+            return entry['digest']
+        return None
+
+    def record(self, action_key: str, stage: str, digest: str):
+        """Remember that ``action_key`` produced ``digest``."""
+        with self._locked_index() as index:
+            index[action_key] = {'stage': stage, 'digest': digest, 'last_used': time.time()}
+            self._write_index()
+
+    def touch(self, action_key: str):
+        with self._locked_index() as index:
+            if action_key in index:
+                index[action_key]['last_used'] = time.time()
+                self._write_index()
+
+    def evict(self, keep_per_stage: int) -> int:
+        """Drop all but the most recently used actions per stage and delete
+        objects no remaining action refers to. Returns objects removed."""
+        removed = 0
+        with self._locked_index() as index:
+            by_stage: Dict[str, list] = {}
+            for key, entry in index.items():
+                by_stage.setdefault(entry['stage'], []).append((entry['last_used'], key))
+
+            for entries in by_stage.values():
+                entries.sort(reverse=True)
+                for _, key in entries[keep_per_stage:]:
+                    del index[key]
+            self._write_index()
+            live = {entry['digest'] for entry in index.values()}
+
+            cutoff = time.time() - self.EVICT_GRACE_SECONDS
+            if os.path.isdir(self.objects_dir):
+                for prefix in os.listdir(self.objects_dir):
+                    prefix_dir = os.path.join(self.objects_dir, prefix)
+                    for name in os.listdir(prefix_dir):
+                        path = os.path.join(prefix_dir, name)
+                        if (name.endswith(".pkl") and name[:-4] not in live
+                                and os.path.getmtime(path) < cutoff):
+                            os.remove(path)
+                            removed += 1
+        if removed:
+            logger.info(f"Evicted {removed} stale artifacts")
+        return removed
+
+
+_memory: "OrderedDict[str, Any]" = OrderedDict()
+_MEMORY_ENTRIES = 8
+_analysis_store: Optional[ArtifactStore] = None
+
+
+def cached_build(kind: str, fingerprint: str, build: Callable[[], Any]) -> Any:
+    """Return the result of ``build`` for a data fingerprint, memoized in
+    memory and on disk so it survives restarts.
+
+    Uses its own store root, so trimming old results here never touches the
+    pipeline's artifacts.
+    """
+    global _analysis_store
+    key = hashlib.sha256(f"{kind}:{fingerprint}".encode('utf-8')).hexdigest()
+    if key in _memory:
+        _memory.move_to_end(key)
+        return _memory[key]
+
+    if _analysis_store is None:
+        _analysis_store = ArtifactStore(ANALYSIS_CACHE_DIR)
+    store = _analysis_store
+
+    digest = store.lookup(key)
+    if digest:
+        store.touch(key)
+        value = store.get(digest)
+    else:
+        value = build()
+        if value is None:
+            return None
+        store.record(key, kind, store.put(value))
+        store.evict(ANALYSIS_CACHE_KEEP)
+
+    _memory[key] = value
+    if len(_memory) > _MEMORY_ENTRIES:
+        _memory.popitem(last=False)
+    return value
\ No newline at end of file
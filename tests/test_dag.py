@@ -0,0 +1,64 @@
+import importlib
+import sys
+import textwrap
+
+import pytest
+
+from pipeline.dag import Pipeline, Stage
+from pipeline.store import ArtifactStore
+
+MODULE = textwrap.dedent("""
+    SCALE = {scale}
+
+
+    def source():
+        return [1, 2, 3]
+
+
+    def scaled(values):
+        return [value * SCALE for value in values]
+""")
+
+
+@pytest.fixture
+def stage_module(tmp_path, monkeypatch):
+    """A throwaway module whose source the test can rewrite."""
+    path = tmp_path / "dag_stage_module.py"
+    path.write_text(MODULE.format(scale=2))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module = importlib.import_module("dag_stage_module")
+
+    def rewrite(scale):
+        path.write_text(MODULE.format(scale=scale))
+        return importlib.reload(module)
+
+    module.rewrite = rewrite
+    yield module
+    sys.modules.pop("dag_stage_module", None)
+
+
+def build(module, store):
+    return Pipeline([
+        Stage('source', module.source, source=True),
+        Stage('scaled', module.scaled, inputs=['source']),
+    ], store)
+
+
+def actions(pipeline):
+    return {step.stage: step.action for step in pipeline.plan(['scaled'])}
+
+
+def test_unchanged_stage_is_cached(stage_module, tmp_path):
+    store = ArtifactStore(str(tmp_path / "store"))
+    assert build(stage_module, store).run(['scaled'])['scaled'] == [2, 4, 6]
+    assert actions(build(stage_module, store))['scaled'] == "cached"
+
+
+def test_module_constant_change_invalidates_stage(stage_module, tmp_path):
+    store = ArtifactStore(str(tmp_path / "store"))
+    build(stage_module, store).run(['scaled'])
+
+    module = stage_module.rewrite(scale=10)
+    pipeline = build(module, store)
+    assert actions(pipeline)['scaled'] == "run"
+    assert pipeline.run(['scaled'])['scaled'] == [10, 20, 30]
@@ -0,0 +1,38 @@
+import pandas as pd
+import pytest
+
+from data.exporter import export_table
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+@pytest.fixture
+def object_keys():
+    """Keep string columns as ``object`` the way pandas < 3 does."""
+    with pd.option_context('future.infer_string', False):
+        yield
+
+
+def rfm_table(keys):
+    return pd.DataFrame({
+        'Monetary': [float(i) for i in range(len(keys))],
+        'Segment': ['High Value'] * len(keys),
+    }, index=pd.Index(keys, dtype=object, name='Customer ID'))
+
+
+def test_parquet_round_trip_keeps_string_keys(tmp_path, object_keys):
+    table = rfm_table(['12346', '12347', 'C-9', '12348'])
+
+    result = export_table(table, str(tmp_path / "clv"), 'parquet', chunk_size=2)
+    restored = pq.read_table(result.path).to_pandas()
+
+    assert restored['Customer ID'].tolist() == ['12346', '12347', 'C-9', '12348']
+    assert restored['Monetary'].tolist() == table['Monetary'].tolist()
+
+
+def test_parquet_export_of_empty_table_has_string_key(tmp_path, object_keys):
+    result = export_table(rfm_table([]), str(tmp_path / "clv"), 'parquet')
+
+    schema = pq.read_schema(result.path)
+    assert str(schema.field('Customer ID').type) == 'string'
+    assert result.rows == 0
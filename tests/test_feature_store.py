@@ -0,0 +1,62 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import features.store
+from features.store import FeatureStore
+
+
+@pytest.fixture
+def rfm():
+    return pd.DataFrame({
+        'Recency': [5, 40, 200],
+        'Frequency': [12, 3, 1],
+        'Monetary': [900.0, 150.0, 20.0],
+        'AvgOrderValue': [75.0, 50.0, 20.0],
+        'PurchaseInterval': [10.0, 60.0, 0.0],
+        'CLV': [1200.0, 180.0, 20.0],
+    }, index=pd.Index([12346, 12347, 12348], name='Customer ID'))
+
+
+def snapshots(store):
+    return sorted(os.listdir(store.snapshots_dir))
+
+
+def test_republishing_identical_features_is_a_no_op(tmp_path, rfm):
+    store = FeatureStore(str(tmp_path))
+    first = store.publish(rfm)
+
+    assert store.publish(rfm) == first
+    assert snapshots(store) == [first]
+
+    changed = store.publish(rfm.assign(Monetary=rfm['Monetary'] + 1))
+    assert changed != first
+    assert store.current_id() == changed
+
+
+def test_failed_publish_leaves_no_temporary_directory(tmp_path, rfm, monkeypatch):
+    store = FeatureStore(str(tmp_path))
+    first = store.publish(rfm)
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(features.store.np, 'save', fail)
+    assert store.publish(rfm.assign(CLV=np.zeros(len(rfm)))) is None
+    assert snapshots(store) == [first]
+    assert store.current_id() == first
+
+
+def test_empty_lookups_and_tables(tmp_path, rfm):
+    store = FeatureStore(str(tmp_path))
+    snapshot = store.open(store.publish(rfm))
+
+    assert len(snapshot.positions([])) == 0
+    assert snapshot.to_frame([]).empty
+
+    empty = store.open(store.publish(rfm.iloc[:0]))
+    assert len(empty) == 0
+    assert empty.get(12346) is None
+    assert empty.to_frame().empty
@@ -0,0 +1,20 @@
+import pandas as pd
+
+from benchmarks.synthetic import make_transactions
+from data.cleaner import clean_data
+from data.loader import load_raw_data
+from features.rfm import calculate_rfm
+
+
+def test_chunked_load_compacts_without_changing_results(tmp_path):
+    path = tmp_path / "transactions.csv"
+    make_transactions(5000).to_csv(path, index=False)
+
+    whole = load_raw_data(str(path))
+    chunked = load_raw_data(str(path), chunk_size=700)
+
+    assert len(chunked) == len(whole)
+    assert isinstance(chunked['Description'].dtype, pd.CategoricalDtype)
+    assert chunked.memory_usage(deep=True).sum() < whole.memory_usage(deep=True).sum()
+    pd.testing.assert_frame_equal(calculate_rfm(clean_data(chunked)),
+                                  calculate_rfm(clean_data(whole)))
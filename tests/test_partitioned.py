@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipeline.partitioned import UNKNOWN_PARTITION, split_partitions
+
+
+@pytest.mark.parametrize("as_category", [False, True])
+def test_rows_without_key_form_their_own_partition(as_category):
+    df = pd.DataFrame({
+        'Country': ['UK', 'UK', np.nan, 'France', 'UK', np.nan],
+        'TotalPrice': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+    })
+    if as_category:
+        df['Country'] = df['Country'].astype('category')
+
+    partitions = dict(split_partitions(df, 'Country'))
+
+    assert sorted(partitions) == sorted(['UK', 'France', UNKNOWN_PARTITION])
+    assert partitions[UNKNOWN_PARTITION]['TotalPrice'].tolist() == [3.0, 6.0]
+    assert sum(len(rows) for rows in partitions.values()) == len(df)
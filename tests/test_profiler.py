@@ -0,0 +1,22 @@
+import os
+
+import utils.profiler
+from utils.profiler import prune_reports
+
+
+def test_prune_removes_dumps_of_stages_with_underscores(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils.profiler, 'PROFILE_DIR', str(tmp_path))
+    run_ids = [f"20260101_000000_00000{i}" for i in range(5)]
+    for run_id in run_ids:
+        for name in (f"{run_id}.json", f"{run_id}_clean.prof", f"{run_id}_lookalike_index.prof"):
+            (tmp_path / name).touch()
+    (tmp_path / "latest_ui.json").touch()
+
+    prune_reports(keep=2)
+
+    remaining = sorted(os.listdir(tmp_path))
+    assert remaining == sorted(
+        [f"{run_id}{suffix}" for run_id in run_ids[-2:]
+         for suffix in (".json", "_clean.prof", "_lookalike_index.prof")]
+        + ["latest_ui.json"]
+    )
@@ -0,0 +1,46 @@
+import os
+import time
+
+from pipeline.store import ArtifactStore
+
+
+def age(store, digest, seconds):
+    """Backdate an object so eviction treats it as settled."""
+    path = store._object_path(digest)
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+
+def test_stores_sharing_a_root_merge_their_records(tmp_path):
+    first = ArtifactStore(str(tmp_path))
+    second = ArtifactStore(str(tmp_path))
+
+    first.record('key-a', 'clean', first.put("a"))
+    second.record('key-b', 'rfm', second.put("b"))
+
+    index = ArtifactStore(str(tmp_path))._read_index()
+    assert set(index) == {'key-a', 'key-b'}
+    assert second.lookup('key-a') is not None
+
+
+def test_evict_keeps_objects_recorded_by_another_store(tmp_path):
+    first = ArtifactStore(str(tmp_path))
+    second = ArtifactStore(str(tmp_path))
+
+    kept = first.put("kept")
+    first.record('key-a', 'clean', kept)
+    stale = second.put("stale")
+    age(first, kept, 3600)
+    age(second, stale, 3600)
+
+    assert second.evict(keep_per_stage=1) == 1
+    assert first.has(kept)
+    assert not second.has(stale)
+
+
+def test_evict_leaves_fresh_unrecorded_objects(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    digest = store.put("in flight")
+
+    assert store.evict(keep_per_stage=1) == 0
+    assert store.has(digest)
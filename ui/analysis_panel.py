@@ -63,7 +63,12 @@ class AnalysisPanel(ttk.Frame):
             
             # Step 1: Calculate RFM metrics
             self.controller.rfm_data = calculate_rfm(self.controller.df)
-            
+            # Anything fitted on the previous RFM table no longer matches it
+            self.controller.model = None
+            self.controller.scaler = None
+            self.controller.predictions = None
+            self.controller.feature_importance = None
+
             if self.controller.rfm_data is None:
                 self._log_result("RFM calculation failed")
                 return
@@ -97,11 +102,16 @@ class AnalysisPanel(ttk.Frame):
             return
             
         try:
-            from models.trainer import train_model, prepare_data
-            X_train, _, y_train, _, _ = prepare_data(self.controller.rfm_data)
+            from models.trainer import train_model, prepare_data, predict_clv, feature_importance
+            X_train, _, y_train, _, scaler = prepare_data(self.controller.rfm_data)
             self.controller.model = train_model(X_train, y_train)
             
             if self.controller.model is not None:
+                self.controller.scaler = scaler
+                self.controller.predictions = predict_clv(
+                    self.controller.rfm_data, self.controller.model, scaler
+                )
+                self.controller.feature_importance = feature_importance(self.controller.model)
                 self._log_result("Model trained successfully")
                 self.controller.update_status("Model training complete")
             else:
@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import ttk, filedialog
 from utils.helpers import safe_str
 from utils.logger import get_logger
+from utils.profiler import start_run, UI_RUN_LABEL
 
 logger = get_logger(__name__)
 
@@ -46,6 +47,7 @@ class DataPanel(ttk.Frame):
             
         try:
             from data.loader import load_raw_data
+            start_run(UI_RUN_LABEL)
             self.controller.df = load_raw_data(file_path)
             
             if self.controller.df is not None:
@@ -60,6 +62,7 @@ class DataPanel(ttk.Frame):
         """Handle sample data generation."""
         try:
             from data.loader import create_sample_data
+            start_run(UI_RUN_LABEL)
             self.controller.df = create_sample_data()
             self._show_info(f"Generated {len(self.controller.df)} sample records")
             self.controller.update_status("Sample data ready")
@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from utils.logger import get_logger
+from utils.profiler import start_run, UI_RUN_LABEL
 
 class MainApplication(tk.Tk):
     def __init__(self):
@@ -14,6 +15,9 @@ class MainApplication(tk.Tk):
         self.df = None
         self.rfm_data = None
         self.model = None
+        self.scaler = None
+        self.predictions = None
+        start_run(UI_RUN_LABEL)
         
         # UI Setup
         self._setup_ui()
@@ -2,8 +2,10 @@ import tkinter as tk
 from tkinter import ttk
 from PIL import Image, ImageTk
 import os
-from config import OUTPUT_DIR
+from config import OUTPUT_DIR, EXPORT_FORMAT
 from utils.logger import get_logger
+from utils.profiler import load_latest_report, UI_RUN_LABEL
+from data.exporter import export_async, available_formats
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
@@ -30,12 +32,21 @@ class ResultsPanel(ttk.Frame):
         self._create_viz_tab("RFM Analysis", "rfm_distributions.png")
         self._create_viz_tab("Feature Importance", "feature_importance.png")
         self._create_segmentation_tab()
+        self._create_cohort_tab()
+        self._create_lookalike_tab()
+        self._create_profiling_tab()
         
         # Add export controls
         self._setup_export_controls()
         
-        # Refresh button
-        ttk.Button(self, text="Refresh Visualizations", command=self._refresh_visualizations).pack(pady=5)
+        # Export format and refresh controls
+        bottom = ttk.Frame(self)
+        bottom.pack(pady=5)
+        formats = available_formats()
+        self.export_format_var = tk.StringVar(value=EXPORT_FORMAT if EXPORT_FORMAT in formats else formats[0])
+        ttk.Label(bottom, text="Export format:").pack(side="left")
+        ttk.OptionMenu(bottom, self.export_format_var, self.export_format_var.get(), *formats).pack(side="left", padx=5)
+        ttk.Button(bottom, text="Refresh Visualizations", command=self._refresh_visualizations).pack(side="left", padx=5)
 
     def _create_viz_tab(self, name, image_file):
         """Create a tab for visualization."""
@@ -106,6 +117,180 @@ class ResultsPanel(ttk.Frame):
             self.segmentation_canvas.draw()
             logger.error(f"Segmentation error: {e}")
 
+    def _create_cohort_tab(self):
+        """Add monthly acquisition-cohort heatmap tab."""
+        tab = ttk.Frame(self.notebook)
+        self.notebook.add(tab, text="Cohorts")
+        self.cohort_result = None
+        self._cohort_source = None  # Frame the current result was built from
+        
+        control_frame = ttk.Frame(tab)
+        control_frame.pack(fill="x", padx=5, pady=5)
+        
+        ttk.Label(control_frame, text="Show:").pack(side="left")
+        self.cohort_metric_var = tk.StringVar(value="retention")
+        ttk.OptionMenu(
+            control_frame,
+            self.cohort_metric_var,
+            "retention",
+            "retention",
+            "revenue",
+            "customers",
+            command=lambda _: self._draw_cohorts()
+        ).pack(side="left")
+        
+        ttk.Button(
+            control_frame,
+            text="Generate",
+            command=self._update_cohorts
+        ).pack(side="left", padx=5)
+        
+        self.cohort_canvas = FigureCanvasTkAgg(plt.Figure(figsize=(10, 6)), master=tab)
+        self.cohort_canvas.get_tk_widget().pack(fill="both", expand=True)
+
+    def _update_cohorts(self):
+        """Compute (or reuse) the cohort matrix for the loaded transactions."""
+        df = getattr(self.controller, 'df', None)
+        if df is None or 'TotalPrice' not in df.columns:
+            self.controller.show_error("No Data", "Please load and clean data first")
+            return
+        
+        # Loading or cleaning data replaces controller.df, so identity is a
+        # free cache key; hashing 1M rows would cost as much as rebuilding
+        if df is not self._cohort_source or self.cohort_result is None:
+            from features.cohort import cohort_matrix
+            self.cohort_result = cohort_matrix(df)
+            self._cohort_source = df if self.cohort_result is not None else None
+        if self.cohort_result is None:
+            self.controller.show_error("Cohort Error", "Cohort calculation failed - check logs")
+            return
+        self._draw_cohorts()
+        self.controller.update_status(f"Cohort matrix ready ({len(self.cohort_result['retention'])} cohorts)")
+
+    def _draw_cohorts(self):
+        """Render the selected cohort metric as a heatmap."""
+        if self.cohort_result is None:
+            return
+        
+        fig = self.cohort_canvas.figure
+        fig.clear()
+        ax = fig.add_subplot(111)
+        metric = self.cohort_metric_var.get()
+        matrix = self.cohort_result[metric]
+        
+        try:
+            sns.heatmap(
+                matrix.set_axis(matrix.index.astype(str), axis=0),
+                ax=ax,
+                cmap="YlGnBu",
+                fmt=".0%" if metric == "retention" else ".0f",
+                annot=matrix.size <= 400
+            )
+            ax.set_title(f"Monthly cohort {metric}")
+            self.cohort_canvas.draw()
+        except Exception as e:
+            ax.text(0.5, 0.5, "Cohort data not available", ha="center")
+            self.cohort_canvas.draw()
+            logger.error(f"Cohort plot error: {e}")
+
+    def _create_lookalike_tab(self):
+        """Add similar-customer search tab."""
+        tab = ttk.Frame(self.notebook)
+        self.notebook.add(tab, text="Lookalikes")
+        self.lookalike_results = None
+        
+        control_frame = ttk.Frame(tab)
+        control_frame.pack(fill="x", padx=5, pady=5)
+        
+        ttk.Label(control_frame, text="Customer IDs:").pack(side="left")
+        self.lookalike_ids_var = tk.StringVar()
+        ttk.Entry(control_frame, textvariable=self.lookalike_ids_var, width=40).pack(side="left", padx=5)
+        
+        ttk.Label(control_frame, text="Neighbours:").pack(side="left")
+        self.lookalike_k_var = tk.IntVar(value=5)
+        ttk.Spinbox(control_frame, from_=1, to=50, textvariable=self.lookalike_k_var, width=5).pack(side="left")
+        
+        ttk.Button(
+            control_frame,
+            text="Find Similar",
+            command=self._find_lookalikes
+        ).pack(side="left", padx=5)
+        
+        columns = ("Customer ID", "Rank", "Lookalike", "Distance")
+        self.lookalike_tree = ttk.Treeview(tab, columns=columns, show="headings")
+        for col in columns:
+            self.lookalike_tree.heading(col, text=col)
+            self.lookalike_tree.column(col, width=150, anchor="center")
+        self.lookalike_tree.pack(fill="both", expand=True, padx=5)
+
+    def _find_lookalikes(self):
+        """Query the nearest-neighbour index for the entered customers."""
+        rfm = getattr(self.controller, 'rfm_data', None)
+        if rfm is None:
+            self.controller.show_error("No RFM Data", "Please calculate RFM metrics first")
+            return
+        
+        ids = [c.strip() for c in self.lookalike_ids_var.get().split(",") if c.strip()]
+        if not ids:
+            self.controller.show_error("No Customers", "Enter one or more customer IDs")
+            return
+        
+        try:
+            from features.similarity import cached_lookalike_index
+            scaler = getattr(self.controller, 'scaler', None)
+            if scaler is None:
+                from models.trainer import prepare_data
+                scaler = prepare_data(rfm)[4]
+            
+            index = cached_lookalike_index(rfm, scaler)
+            if index is None:
+                raise ValueError("Could not build lookalike index - check logs")
+            self.lookalike_results = index.query(ids, k=self.lookalike_k_var.get())
+        except Exception as e:
+            self.controller.show_error("Lookalike Error", str(e))
+            logger.error(f"Lookalike search failed: {e}")
+            return
+        
+        self.lookalike_tree.delete(*self.lookalike_tree.get_children())
+        for row in self.lookalike_results.itertuples(index=False):
+            self.lookalike_tree.insert("", "end", values=(row[0], row[1], row[2], f"{row[3]:.4f}"))
+        self.controller.update_status(f"Found lookalikes for {len(ids)} customers")
+
+    def _create_profiling_tab(self):
+        """Add per-stage timing and memory table for the latest run."""
+        tab = ttk.Frame(self.notebook)
+        self.notebook.add(tab, text="Profiling")
+
+        self.profile_summary_var = tk.StringVar()
+        ttk.Label(tab, textvariable=self.profile_summary_var).pack(fill="x", padx=5, pady=5)
+
+        columns = ("stage", "status", "wall_time_s", "cpu_time_s",
+                   "sampled_peak_rss_mb", "traced_peak_mb", "rows_in", "rows_out")
+        self.profile_tree = ttk.Treeview(tab, columns=columns, show="headings")
+        for col in columns:
+            self.profile_tree.heading(col, text=col.replace('_', ' ').title())
+            self.profile_tree.column(col, width=110, anchor="center")
+        self.profile_tree.pack(fill="both", expand=True, padx=5)
+        self._update_profiling()
+
+    def _update_profiling(self):
+        """Reload the latest profiling report into the table."""
+        self.profile_tree.delete(*self.profile_tree.get_children())
+        report = load_latest_report(UI_RUN_LABEL)
+        if not report:
+            self.profile_summary_var.set("No profiling data yet - run an analysis first")
+            return
+
+        self.profile_summary_var.set(
+            f"Run {report['run_id']} ({report['label']}) - "
+            f"total {report['total_wall_time_s']:.2f}s across {len(report['stages'])} stages"
+        )
+        for stage in report['stages']:
+            self.profile_tree.insert("", "end", values=[
+                "" if stage.get(col) is None else stage[col]
+                for col in self.profile_tree["columns"]
+            ])
+
     def _setup_export_controls(self):
         """Add export buttons to each tab."""
         for tab_id in self.notebook.tabs():
@@ -123,7 +308,7 @@ class ResultsPanel(ttk.Frame):
             ttk.Button(
                 export_frame,
                 text="Export Data",
-                command=lambda t=tab_id: self._export_as_csv(t)
+                command=lambda t=tab_id: self._export_data(t)
             ).pack(side="left")
 
     def _load_image(self, parent, image_path):
@@ -176,6 +361,8 @@ class ResultsPanel(ttk.Frame):
             if image_file:
                 self._load_image(tab, os.path.join(OUTPUT_DIR, image_file))
         
+        self._update_profiling()
+        
         self.controller.update_status("Visualizations refreshed")
 
     def _export_as_image(self, tab_id):
@@ -194,23 +381,46 @@ class ResultsPanel(ttk.Frame):
         
         self.controller.show_error("Export Failed", "No visualization found to export")
 
-    def _export_as_csv(self, tab_id):
-        """Export underlying data as CSV."""
+    def _export_table_for(self, tab_name):
+        """Return the table behind a tab, or None if nothing is exportable."""
+        rfm = getattr(self.controller, 'rfm_data', None)
+        predictions = getattr(self.controller, 'predictions', None)
+        
+        if tab_name == "Profiling":
+            report = load_latest_report(UI_RUN_LABEL)
+            return pd.DataFrame(report['stages']) if report else None
+        if tab_name == "Feature Importance":
+            return getattr(self.controller, 'feature_importance', None)
+        if tab_name == "Cohorts" and self.cohort_result is not None:
+            matrix = self.cohort_result[self.cohort_metric_var.get()]
+            return matrix.set_axis(matrix.index.astype(str), axis=0).rename(columns=str)
+        if tab_name == "Lookalikes":
+            return self.lookalike_results
+        if tab_name in ("Segmentation", "RFM Analysis") and rfm is not None:
+            return rfm.join(predictions) if predictions is not None else rfm
+        return None
+
+    def _export_data(self, tab_id):
+        """Export the tab's underlying table in the background."""
         tab_name = self.notebook.tab(tab_id, "text")
-        export_path = os.path.join(OUTPUT_DIR, f"{tab_name.replace(' ', '_')}.csv")
+        table = self._export_table_for(tab_name)
+        if table is None:
+            self.controller.show_error("Export Failed", "No exportable data for this tab")
+            return
+        
+        path_stem = os.path.join(OUTPUT_DIR, tab_name.replace(' ', '_'))
+        future = export_async(table, path_stem, self.export_format_var.get())
+        self.controller.update_status(f"Exporting {tab_name} data...")
+        self.after(100, lambda: self._poll_export(future, tab_name))
+
+    def _poll_export(self, future, tab_name):
+        """Report the export outcome once the background write finishes."""
+        if not future.done():
+            self.after(100, lambda: self._poll_export(future, tab_name))
+            return
         
         try:
-            if hasattr(self.controller, 'rfm_data'):
-                if tab_name == "Segmentation":
-                    self.controller.rfm_data.to_csv(export_path, index=False)
-                elif tab_name == "Feature Importance" and hasattr(self.controller, 'feature_importance'):
-                    self.controller.feature_importance.to_csv(export_path, index=False)
-                else:
-                    raise ValueError("No exportable data for this tab")
-                
-                self.controller.update_status(f"Exported {tab_name} data to {export_path}")
-            else:
-                raise ValueError("No analysis data available")
+            self.controller.update_status(str(future.result()))
         except Exception as e:
             self.controller.show_error("Export Failed", str(e))
-            logger.error(f"Export failed: {e}")
\ No newline at end of file
+            logger.error(f"Export of {tab_name} failed: {e}")
@@ -1,5 +1,15 @@
+import hashlib
+import os
+import tempfile
+from contextlib import contextmanager
 from typing import Any
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
 def safe_str(obj: Any) -> str:
     """Safely convert any object to string, handling None."""
     if obj is None:
@@ -7,4 +17,45 @@ def safe_str(obj: Any) -> str:
     try:
         return str(obj)
     except Exception:
-        return ""
\ No newline at end of file
+        return ""
+
+def atomic_write(path: str, data: bytes):
+    """Write bytes to a temporary file and rename it into place."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+@contextmanager
+def file_lock(path: str):
+    """Hold an exclusive inter-process lock on ``path`` for the block."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+def data_fingerprint(df) -> str:
+    """Stable SHA-256 of a DataFrame's values and index."""
+    import pandas as pd
+    hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    digest = hashlib.sha256(hashes.tobytes())
+    digest.update(repr(list(df.columns)).encode('utf-8'))
+    return digest.hexdigest()
\ No newline at end of file
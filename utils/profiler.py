@@ -0,0 +1,314 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional
+from utils.logger import get_logger
+from config import (PROFILE_ENABLED, PROFILE_TRACK_MEMORY, PROFILE_SAMPLE_RSS,
+                    PROFILE_SAMPLE_INTERVAL, PROFILE_CPROFILE, PROFILE_DIR, PROFILE_KEEP_REPORTS)
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+logger = get_logger(__name__)
+
+UI_RUN_LABEL = "ui"
+
+_lock = threading.Lock()
+_current_run = None
+_track_memory = PROFILE_TRACK_MEMORY
+
+
+def _count_rows(obj: Any) -> Optional[int]:
+    """Best-effort row count for frames, arrays and (X, ...) tuples."""
+    if hasattr(obj, 'shape') and len(getattr(obj, 'shape', ())) > 0:
+        return int(obj.shape[0])
+    if isinstance(obj, tuple) and obj:
+        return _count_rows(obj[0])
+    return None
+
+
+def _current_rss_mb() -> Optional[float]:
+    """Resident set size right now in MB (Linux only; None elsewhere)."""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class _RssSampler(threading.Thread):
+    """Background thread polling RSS to find a stage's peak without tracing
+    every allocation the way tracemalloc does."""
+
+    def __init__(self, interval: float):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = _current_rss_mb()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self._sample()
+
+    def _sample(self):
+        rss = _current_rss_mb()
+        if rss is not None and (self.peak is None or rss > self.peak):
+            self.peak = rss
+
+    def stop(self) -> Optional[float]:
+        self._stop_event.set()
+        self.join()
+        self._sample()
+        return None if self.peak is None else round(self.peak, 2)
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Process high-water mark RSS in MB, if the platform exposes it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(peak / divisor, 2)
+
+
+class StageRecord:
+    """Timing and resource figures for one execution of a pipeline stage."""
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self.status = "ok"
+        self.wall_time_s = 0.0
+        self.cpu_time_s = 0.0
+        self.traced_peak_mb = None
+        self.sampled_peak_rss_mb = None
+        self.peak_rss_mb = None
+        self.rows_in = None
+        self.rows_out = None
+        self.profile_path = None
+        self.top_functions = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.__dict__)
+
+
+class ProfileRun:
+    """Collection of stage records belonging to one analysis run."""
+
+    def __init__(self, label: str = "run", persist: bool = True):
+        self.label = label
+        self.persist = persist
+        self.run_id = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self.stages: List[StageRecord] = []
+
+    def add(self, record: StageRecord):
+        with _lock:
+            self.stages.append(record)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with _lock:
+            stages = [record.to_dict() for record in self.stages]
+        return {
+            'run_id': self.run_id,
+            'label': self.label,
+            'started_at': self.started_at,
+            'total_wall_time_s': round(sum(s['wall_time_s'] for s in stages), 4),
+            'stages': stages,
+        }
+
+    def save(self) -> Optional[str]:
+        """Write the run report as JSON and refresh the latest copy for its label."""
+        if not self.persist:
+            return None
+        try:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            payload = json.dumps(self.to_dict(), indent=2)
+            report_path = os.path.join(PROFILE_DIR, f"{self.run_id}.json")
+            for path in (report_path, _latest_path(self.label)):
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(payload)
+            return report_path
+        except Exception as e:
+            logger.error(f"Could not write profiling report: {e}")
+            return None
+
+
+def start_run(label: str = "run", persist: bool = True) -> ProfileRun:
+    """Begin a new profiling run; later stages are recorded against it.
+
+    Worker processes pass ``persist=False`` so they do not overwrite the
+    parent's report files.
+    """
+    global _current_run
+    with _lock:
+        _current_run = ProfileRun(label, persist)
+    if persist:
+        prune_reports()
+    return _current_run
+
+
+def current_run() -> ProfileRun:
+    """Return the active run, starting one if needed."""
+    with _lock:
+        run = _current_run
+    return run if run is not None else start_run()
+
+
+def _latest_path(label: str) -> str:
+    safe_label = re.sub(r'[^A-Za-z0-9_.-]+', '_', label)
+    return os.path.join(PROFILE_DIR, f"latest_{safe_label}.json")
+
+
+def prune_reports(keep: int = PROFILE_KEEP_REPORTS):
+    """Remove all but the newest ``keep`` run reports and their cProfile dumps."""
+    if not os.path.isdir(PROFILE_DIR):
+        return
+    run_ids = sorted(
+        (name[:-5] for name in os.listdir(PROFILE_DIR)
+         if name.endswith(".json") and not name.startswith("latest_")),
+        reverse=True
+    )
+    stale = tuple(f"{run_id}{sep}" for run_id in run_ids[max(1, keep):] for sep in (".", "_"))
+    if not stale:
+        return
+    for name in os.listdir(PROFILE_DIR):
+        # <run_id>.json and <run_id>_<stage>.prof; stage names may contain "_"
+        if name.startswith(stale):
+            try:
+                os.remove(os.path.join(PROFILE_DIR, name))
+            except OSError as e:
+                logger.warning(f"Could not remove profiling report {name}: {e}")
+
+
+def load_latest_report(label: str) -> Optional[Dict[str, Any]]:
+    """Read the most recently written run report for a run label, if any."""
+    path = _latest_path(label)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.error(f"Could not read profiling report: {e}")
+        return None
+
+
+def set_memory_tracking(enabled: bool):
+    """Turn tracemalloc-based peak measurement on or off at runtime.
+
+    Tracing every allocation slows pandas-heavy stages several times over,
+    so timings should be taken with it off and memory measured separately.
+    """
+    global _track_memory
+    _track_memory = enabled
+
+
+def profile_stage(stage: str) -> Callable:
+    """Decorator recording wall/CPU time, peak memory and row counts of a stage.
+
+    Row counts are taken from the first positional argument and from the
+    return value. A ``None`` return is recorded as a failed stage, matching
+    the convention used by the pipeline functions.
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not PROFILE_ENABLED:
+                return func(*args, **kwargs)
+
+            record = StageRecord(stage)
+            record.rows_in = _count_rows(args[0]) if args else None
+
+            track_memory = _track_memory
+            started_tracing = False
+            if track_memory:
+                if tracemalloc.is_tracing():
+                    tracemalloc.reset_peak()
+                else:
+                    tracemalloc.start()
+                    started_tracing = True
+
+            profiler = None
+            if PROFILE_CPROFILE:
+                profiler = cProfile.Profile()
+                try:
+                    profiler.enable()
+                except ValueError:  # Another profiler is already active
+                    profiler = None
+
+            sampler = None
+            if PROFILE_SAMPLE_RSS and _current_rss_mb() is not None:
+                sampler = _RssSampler(PROFILE_SAMPLE_INTERVAL)
+                sampler.start()
+
+            wall_start = time.perf_counter()
+            cpu_start = time.process_time()
+            result = None
+            try:
+                result = func(*args, **kwargs)
+                if result is None or result is False:
+                    record.status = "failed"
+                return result
+            except Exception:
+                record.status = "error"
+                raise
+            finally:
+                record.wall_time_s = round(time.perf_counter() - wall_start, 4)
+                record.cpu_time_s = round(time.process_time() - cpu_start, 4)
+
+                if profiler is not None:
+                    profiler.disable()
+                    _attach_profile(record, profiler)
+
+                if sampler is not None:
+                    record.sampled_peak_rss_mb = sampler.stop()
+
+                if track_memory:
+                    _, peak = tracemalloc.get_traced_memory()
+                    record.traced_peak_mb = round(peak / (1024 * 1024), 2)
+                    if started_tracing:
+                        tracemalloc.stop()
+
+                record.peak_rss_mb = _peak_rss_mb()
+                record.rows_out = _count_rows(result)
+
+                run = current_run()
+                run.add(record)
+                run.save()
+                logger.info(
+                    f"[profile] {stage}: wall={record.wall_time_s:.3f}s "
+                    f"cpu={record.cpu_time_s:.3f}s "
+                    f"peak={record.traced_peak_mb or record.sampled_peak_rss_mb}MB "
+                    f"rows={record.rows_in}->{record.rows_out}"
+                )
+        return wrapper
+    return decorator
+
+
+def _attach_profile(record: StageRecord, profiler: cProfile.Profile):
+    """Dump cProfile stats next to the report and keep a short summary."""
+    try:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        run = current_run()
+        record.profile_path = os.path.join(PROFILE_DIR, f"{run.run_id}_{record.stage}.prof")
+        profiler.dump_stats(record.profile_path)
+
+        buffer = io.StringIO()
+        pstats.Stats(profiler, stream=buffer).sort_stats('cumulative').print_stats(15)
+        record.top_functions = buffer.getvalue().strip().splitlines()
+    except Exception as e:
+        logger.error(f"Could not save cProfile output for {record.stage}: {e}")
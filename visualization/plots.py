@@ -5,9 +5,11 @@ import seaborn as sns
 import os
 from config import OUTPUT_DIR
 from utils.logger import get_logger
+from utils.profiler import profile_stage
 
 logger = get_logger(__name__)
 
+@profile_stage("plots")
 def generate_rfm_plots(rfm_data):
     """Generate and save RFM visualization plots."""
     try: